@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Feiertagstabelle für alle Bundesländer über viele Jahre
+Berechnet und schreibt die komplette Matrix (Standard: 2000-2060 × 16 Bundesländer)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from holiday_manager import BUNDESLAENDER, compute_holiday_table, save_holiday_table
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Feiertags-Bulkberechnung')
+    parser.add_argument('--first-year', type=int, default=2000, help='Erstes Jahr (Standard: 2000)')
+    parser.add_argument('--last-year', type=int, default=2060, help='Letztes Jahr (Standard: 2060)')
+    parser.add_argument('--budget', type=float, default=1.0, help='Zeitbudget in Sekunden (Standard: 1.0)')
+    
+    args = parser.parse_args()
+    
+    years = list(range(args.first_year, args.last_year + 1))
+    state_codes = list(BUNDESLAENDER)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        started = time.perf_counter()
+        table = compute_holiday_table(years, state_codes)
+        computed = time.perf_counter()
+        table_file = save_holiday_table(table, years, os.path.join(tmp_dir, 'holidays_table.json'))
+        finished = time.perf_counter()
+        size = os.path.getsize(table_file)
+    
+    total = sum(len(holidays) for holidays in table.values())
+    elapsed = finished - started
+    
+    print(f"Jahre:        {years[0]}-{years[-1]} ({len(years)})")
+    print(f"Bundesländer: {len(state_codes)}")
+    print(f"Feiertage:    {total}")
+    print(f"Berechnung:   {(computed - started) * 1000:.1f} ms")
+    print(f"Schreiben:    {(finished - computed) * 1000:.1f} ms ({size / 1024:.0f} KiB)")
+    print(f"Gesamt:       {elapsed * 1000:.1f} ms (Budget {args.budget * 1000:.0f} ms)")
+    
+    if elapsed > args.budget:
+        print("❌ Budget überschritten")
+        sys.exit(1)
+    print("✅ Innerhalb des Budgets")
+
+if __name__ == '__main__':
+    main()
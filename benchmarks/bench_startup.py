@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Kaltstart der Hooks und CLI-Einstiegspunkte
+Misst Importzeit (python -X importtime) über dem nackten Interpreter und die Laufzeit pro Aufruf.
+Budgets: Importzeit bei leerer Eingabe (kein Modul darf vorab laden) und
+Gesamtlaufzeit mit einem echten Intervall (Import, Stufen, Rollup, Ausgabe)
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import argparse
+from datetime import date
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HOOKS = ['on-modify', 'on-modify-autopause', 'on-modify-warnings', 'on-modify-holidays']
+
+CLIS = ['daily_report.py', 'weekly_report.py', 'monthly_report.py',
+        'holiday_manager.py', 'vacation_manager.py']
+
+SAMPLE_INTERVAL = '{"start": "20240315T080000Z", "end": "20240315T120000Z", "tags": ["bench"]}'
+
+def install(home):
+    """Installation wie setup.sh in ein temporäres HOME (Hooks, Stufen, lib)"""
+    timew_dir = os.path.join(home, '.timewarrior')
+    for sub in ('hooks/stages', 'lib', 'data'):
+        os.makedirs(os.path.join(timew_dir, sub), exist_ok=True)
+
+    for name in os.listdir(os.path.join(ROOT, 'scripts')):
+        if name.endswith('.py'):
+            shutil.copy(os.path.join(ROOT, 'scripts', name), os.path.join(timew_dir, 'lib'))
+    shutil.copy(os.path.join(ROOT, 'hooks', 'on-modify'), os.path.join(timew_dir, 'hooks'))
+    for hook in HOOKS[1:]:
+        shutil.copy(os.path.join(ROOT, 'hooks', hook), os.path.join(timew_dir, 'hooks', 'stages'))
+    shutil.copy(os.path.join(ROOT, 'config', 'timewarrior.cfg'), timew_dir)
+
+    # Monatsdatei mit zwei Intervallen pro Tag bis heute, damit das Rollup echte Daten liest
+    today = date.today()
+    with open(os.path.join(timew_dir, 'data', today.strftime('%Y-%m.data')), 'w', encoding='utf-8') as f:
+        for day in range(1, today.day + 1):
+            stamp = today.replace(day=day).strftime('%Y%m%d')
+            f.write(f"inc {stamp}T080000Z - {stamp}T120000Z # bench\n")
+            f.write(f"inc {stamp}T130000Z - {stamp}T170000Z # bench\n")
+    return timew_dir
+
+def measure(command, env, stdin='', runs=5):
+    """(Importzeit in ms, Laufzeit in ms) - jeweils bester von runs Läufen"""
+    best_import = best_wall = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + command, input=stdin,
+                                capture_output=True, text=True, env=env)
+        wall = (time.perf_counter() - started) * 1000
+
+        imported = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            # Nur Module der obersten Ebene (eingerückte sind darin enthalten)
+            if not name.startswith('  '):
+                imported += int(cumulative)
+
+        imported /= 1000
+        best_import = imported if best_import is None else min(best_import, imported)
+        best_wall = wall if best_wall is None else min(best_wall, wall)
+    return best_import, best_wall
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Kaltstart von Hooks und CLIs')
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='Max. Importzeit eines Hooks bei leerer Eingabe in ms (Standard: 10)')
+    parser.add_argument('--interval-budget', type=float, default=100.0,
+                        help='Max. Laufzeit eines Hooks mit Intervall in ms über dem Interpreter (Standard: 100)')
+    parser.add_argument('--runs', type=int, default=5, help='Läufe pro Messung (Standard: 5)')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        timew_dir = install(home)
+        env = dict(os.environ, HOME=home)
+
+        baseline, baseline_wall = measure(['-c', 'pass'], env, runs=args.runs)
+        print(f"Interpreter ohne Skript: {baseline:.1f} ms Import, {baseline_wall:.1f} ms gesamt\n")
+        print(f"{'Einstiegspunkt':<28} {'Eingabe':<10} {'Import':>9} {'Gesamt':>9}")
+        print('-' * 60)
+
+        over_budget = []
+        for hook in HOOKS:
+            path = os.path.join(timew_dir, 'hooks', hook) if hook == 'on-modify' \
+                else os.path.join(timew_dir, 'hooks', 'stages', hook)
+            for label, stdin in (('leer', ''), ('intervall', SAMPLE_INTERVAL)):
+                imported, wall = measure([path], env, stdin, args.runs)
+                imported -= baseline
+                marker = ''
+                if label == 'leer' and imported > args.budget:
+                    over_budget.append(f"{hook} (leer, Import)")
+                    marker = ' ❌'
+                elif label == 'intervall' and wall - baseline_wall > args.interval_budget:
+                    over_budget.append(f"{hook} (intervall, Gesamt)")
+                    marker = ' ❌'
+                print(f"{hook:<28} {label:<10} {imported:>6.1f} ms {wall:>6.1f} ms{marker}")
+
+        for script in CLIS:
+            imported, wall = measure([os.path.join(ROOT, 'scripts', script), '--help'], env,
+                                     runs=args.runs)
+            print(f"{script:<28} {'--help':<10} {imported - baseline:>6.1f} ms {wall:>6.1f} ms")
+
+    print(f"\nBudget Hooks (leere Eingabe): {args.budget:.1f} ms Import über dem Interpreter")
+    print(f"Budget Hooks (Intervall):     {args.interval_budget:.1f} ms Gesamt über dem Interpreter")
+    if over_budget:
+        print(f"❌ Budget überschritten: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("✅ Innerhalb des Budgets")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Zeitstempel-Parsing
+Vergleicht datetime.fromisoformat(...replace('Z', '+00:00')).timestamp() mit
+timestamps.parse_epoch (einzeln und als Batch) über synthetische Export-Intervalle:
+einmal kalt über alle Intervalle, einmal wiederholt über wenige (warmes Memo,
+wie im Hook-Daemon)
+"""
+
+import os
+import random
+import sys
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import timestamps
+from timestamps import format_epoch, parse_epoch, parse_bounds
+
+def make_intervals(count, seed=42):
+    """Export-Einträge wie von timew: lückenlos oder mit Pausen, mehrere pro Tag"""
+    rng = random.Random(seed)
+    current = 1577836800  # 01.01.2020
+    intervals = []
+    for _ in range(count):
+        start = current + rng.choice((0, 0, 300, 900, 1800, 3600, 50000))
+        end = start + rng.randint(600, 4 * 3600)
+        intervals.append({'start': format_epoch(start), 'end': format_epoch(end), 'tags': ['bench']})
+        current = end
+    return intervals
+
+def parse_fromisoformat(intervals):
+    """Bisheriger Weg: zwei datetime-Objekte pro Intervall"""
+    return [(int(datetime.fromisoformat(entry['start'].replace('Z', '+00:00')).timestamp()),
+             int(datetime.fromisoformat(entry['end'].replace('Z', '+00:00')).timestamp()))
+            for entry in intervals]
+
+def parse_single(intervals):
+    """parse_epoch pro Wert"""
+    return [(parse_epoch(entry['start']), parse_epoch(entry['end'])) for entry in intervals]
+
+def parse_batch(intervals):
+    """parse_bounds über die ganze Liste"""
+    return parse_bounds(intervals)
+
+def repeated(function, repeats):
+    """Dieselben Intervalle mehrmals parsen (z.B. aufeinanderfolgende Hook-Aufrufe)"""
+    def run(intervals):
+        for _ in range(repeats - 1):
+            function(intervals)
+        return function(intervals)
+    return run
+
+def measure(functions, intervals, runs, cold=True):
+    """Beste Laufzeit in ms je Verfahren; bei cold Memo und Tagestabellen vor jedem Lauf geleert
+
+    Die Verfahren laufen abwechselnd, damit Schwankungen der Maschine alle gleich treffen.
+    """
+    best = [None] * len(functions)
+    results = [None] * len(functions)
+    for _ in range(runs):
+        for position, function in enumerate(functions):
+            if cold:
+                timestamps._memo.clear()
+                timestamps._days.clear()
+            started = time.perf_counter()
+            results[position] = function(intervals)
+            elapsed = (time.perf_counter() - started) * 1000
+            best[position] = elapsed if best[position] is None else min(best[position], elapsed)
+    return best, results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Zeitstempel-Parsing')
+    parser.add_argument('--count', type=int, default=100000, help='Anzahl Intervalle (Standard: 100000)')
+    parser.add_argument('--runs', type=int, default=5, help='Läufe pro Messung (Standard: 5)')
+    parser.add_argument('--repeats', type=int, default=50,
+                        help='Wiederholungen im warmen Szenario (Standard: 50)')
+
+    args = parser.parse_args()
+
+    intervals = make_intervals(args.count)
+    # Passt ins Memo: die letzten Intervalle, wie sie ein Hook wiederholt sieht
+    recent = intervals[-(timestamps.MEMO_SIZE // 2):]
+
+    scenarios = [
+        (f"Kalt: {args.count} Intervalle", intervals, True, [
+            ('fromisoformat (bisher)', parse_fromisoformat),
+            ('parse_epoch', parse_single),
+            ('parse_bounds (Batch)', parse_batch),
+        ]),
+        (f"Warm: {len(recent)} Intervalle × {args.repeats}", recent, False, [
+            ('fromisoformat (bisher)', repeated(parse_fromisoformat, args.repeats)),
+            ('parse_epoch (Memo)', repeated(parse_single, args.repeats)),
+        ]),
+    ]
+
+    print(f"Bester von {args.runs} Läufen\n")
+    for title, data, cold, functions in scenarios:
+        print(f"{title}")
+        print(f"{'Verfahren':<32} {'Zeit':>10} {'Faktor':>8}")
+        print('-' * 52)
+        timings, results = measure([function for _, function in functions], data, args.runs, cold)
+        baseline, expected = timings[0], results[0]
+        for (label, _), elapsed, result in zip(functions, timings, results):
+            if result != expected:
+                print(f"❌ {label}: abweichende Ergebnisse")
+                sys.exit(1)
+            print(f"{label:<32} {elapsed:>7.1f} ms {baseline / elapsed:>7.1f}x")
+        print()
+
+if __name__ == '__main__':
+    main()
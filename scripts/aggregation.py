@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Aggregation
+Gemeinsame Auswertung für Tages-, Wochen- und Monatsbericht in einem Durchlauf
+
+Jedes Intervall wird genau einmal gelesen, an lokaler Mitternacht geteilt und
+in eine Tag × Projekt-Matrix einsortiert; Summen pro Tag, Woche und Projekt
+sowie die Anzahl der Tage je Projekt entstehen dabei mit. Gelesen wird aus den
+Spalten einer IntervalTable; die Berichte geben nur noch aus.
+"""
+
+import time
+
+from interval_table import IntervalTable, OPEN_END
+from local_time import local_days
+
+class Aggregation:
+    """Tag × Projekt-Matrix mit Summen pro Tag, Kalenderwoche und Projekt"""
+
+    def __init__(self, days=None, calendar=None):
+        # Nur diese Tage zählen (None = alle)
+        self.days = set(days) if days is not None else None
+        self.calendar = calendar or local_days()
+        self.matrix = {}           # Tag -> {Projekt: Sekunden}
+        self.day_totals = {}       # Tag -> Sekunden
+        self.week_totals = {}      # (ISO-Jahr, KW) -> Sekunden
+        self.projects = {}         # Projekt -> Sekunden
+        self.project_days = {}     # Projekt -> Anzahl Tage mit Zeit > 0
+        self.project_entries = {}  # Projekt -> Anzahl Einträge
+        self.entries = IntervalTable()  # Teilstücke pro Tag (nur mit keep_entries)
+        self.total = 0
+
+    def add(self, day, project, duration):
+        """Verbuche duration Sekunden auf (Tag, Projekt); False, wenn der Tag nicht zählt"""
+        if self.days is not None and day not in self.days:
+            return False
+
+        row = self.matrix.get(day)
+        if row is None:
+            row = self.matrix[day] = {}
+            self.day_totals[day] = 0
+        before = row.get(project, 0)
+        row[project] = before + duration
+        if before <= 0 < before + duration:
+            self.project_days[project] = self.project_days.get(project, 0) + 1
+
+        self.day_totals[day] += duration
+        week = day.isocalendar()[:2]
+        self.week_totals[week] = self.week_totals.get(week, 0) + duration
+        self.projects[project] = self.projects.get(project, 0) + duration
+        self.project_entries[project] = self.project_entries.get(project, 0) + 1
+        self.total += duration
+        return True
+
+    def day_projects(self, day):
+        """{Projekt: Sekunden} eines Tages"""
+        return self.matrix.get(day, {})
+
+    def day_total(self, day):
+        """Sekunden eines Tages"""
+        return self.day_totals.get(day, 0)
+
+    def top_projects(self, day=None, limit=None):
+        """Projekte absteigend nach Dauer (eines Tages oder des ganzen Zeitraums)"""
+        projects = self.projects if day is None else self.day_projects(day)
+        ranked = sorted(projects.items(), key=lambda x: x[1], reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+def aggregate(intervals, days=None, include_active=False, now=None, keep_entries=False,
+              calendar=None):
+    """Werte Intervalle (IntervalTable oder Export-Einträge) in einem Durchlauf aus
+
+    Intervalle über Mitternacht werden auf die lokalen Tage (calendar, Standard:
+    konfigurierte Zeitzone) aufgeteilt. Aktive Einträge werden übersprungen,
+    außer include_active (dann zählen sie bis now, Epoch-Sekunden). keep_entries
+    behält die Teilstücke als IntervalTable für die Detailansicht des Tagesberichts.
+    """
+    result = Aggregation(days, calendar)
+    calendar = result.calendar
+    if include_active and now is None:
+        now = int(time.time())
+    if not isinstance(intervals, IntervalTable):
+        intervals = IntervalTable.from_export(intervals)
+
+    entries = result.entries
+    entries.now = now
+    projects = intervals.projects
+    tag_sets = intervals.tag_sets
+
+    for start, end, tag_id in zip(intervals.starts, intervals.ends, intervals.tag_ids):
+        active = end == OPEN_END
+        if active:
+            if not include_active:
+                continue
+            end = now
+        project = projects[tag_id]
+
+        for day, part_start, part_end in calendar.split(start, end):
+            if result.add(day, project, part_end - part_start) and keep_entries:
+                entries.append(part_start, None if active and part_end == end else part_end,
+                               tag_sets[tag_id])
+
+    return result
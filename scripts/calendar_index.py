@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Calendar Index
+Lädt Feiertage und Urlaube einmal pro Prozess und beantwortet Abfragen schnell
+
+load_calendar() nimmt die Binärkopie aus calendar_store, falls sie sich bauen
+und lesen lässt; sonst beantwortet der CalendarIndex die Abfragen direkt aus
+den JSON-Dateien.
+"""
+
+import json
+import os
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import islice
+
+from vacation_journal import VACATION_FILE, JOURNAL_FILE, load_vacations
+
+HOLIDAYS_FILE = os.path.expanduser('~/.timewarrior/data/holidays/holidays.json')
+CONFIG_FILE = os.path.expanduser('~/.timewarrior/data/config/regional.json')
+
+# Quelldateien von Feiertagen und Urlauben (Signatur für abgeleitete Caches)
+SOURCE_FILES = (HOLIDAYS_FILE, VACATION_FILE, JOURNAL_FILE, CONFIG_FILE)
+
+def load_holidays():
+    """Lade Feiertage aus lokaler Datei"""
+    try:
+        with open(HOLIDAYS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_state_code():
+    """Lade konfiguriertes Bundesland (oder None)"""
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('state')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def source_signature():
+    """(mtime_ns, Größe) aller Quelldateien; fehlende Dateien als (-1, -1)"""
+    signature = []
+    for path in SOURCE_FILES:
+        try:
+            stat = os.stat(path)
+            signature.extend((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.extend((-1, -1))
+    return tuple(signature)
+
+def date_key(check_date):
+    """Normalisiere Datum (date oder 'YYYY-MM-DD') zum Schlüssel 'YYYY-MM-DD'"""
+    if isinstance(check_date, str):
+        return check_date
+    return check_date.isoformat()
+
+def parse_date(date_str):
+    """'YYYY-MM-DD' zu date (schneller als strptime)"""
+    return date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+class VacationIndex:
+    """Urlaube als sortierter Intervall-Index mit bisect-Suche
+
+    Überschneiden sich Einträge, gehört ein Tag deterministisch dem zuerst
+    eingetragenen Urlaub (niedrigste Position, d.h. niedrigste ID).
+    """
+
+    def __init__(self, vacations):
+        # (start, end, position, vacation) mit Tagen als Ordinalzahlen
+        entries = []
+        for position, vacation in enumerate(vacations):
+            try:
+                start = parse_date(vacation['start']).toordinal()
+                end = parse_date(vacation['end']).toordinal()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if start <= end:
+                entries.append((start, end, position, vacation))
+        entries.sort(key=lambda x: (x[0], x[2]))
+
+        self.entries = entries
+        self.entry_starts = [entry[0] for entry in entries]
+
+        # Überschneidungsfreie Abschnitte: Sweep über alle Grenzen, aktiver
+        # Eintrag mit der niedrigsten Position gewinnt
+        boundaries = sorted({entry[0] for entry in entries} | {entry[1] + 1 for entry in entries})
+        self.segment_starts = []
+        self.segment_ends = []
+        self.segment_entries = []
+        active = []
+        next_entry = 0
+        for i, boundary in enumerate(boundaries[:-1]):
+            while next_entry < len(entries) and entries[next_entry][0] == boundary:
+                start, end, position, vacation = entries[next_entry]
+                heapq.heappush(active, (position, end, start, vacation))
+                next_entry += 1
+            while active and active[0][1] < boundary:
+                heapq.heappop(active)
+            if not active:
+                continue
+
+            position, end, start, vacation = active[0]
+            segment_end = boundaries[i + 1] - 1
+            if (self.segment_entries and self.segment_entries[-1][0] == position
+                    and self.segment_ends[-1] == boundary - 1):
+                self.segment_ends[-1] = segment_end
+            else:
+                self.segment_starts.append(boundary)
+                self.segment_ends.append(segment_end)
+                self.segment_entries.append((position, vacation))
+
+    def lookup(self, check_date):
+        """Urlaubseintrag für ein Datum oder None - O(log n)"""
+        ordinal = check_date.toordinal()
+        i = bisect_right(self.segment_starts, ordinal) - 1
+        if i >= 0 and ordinal <= self.segment_ends[i]:
+            return self.segment_entries[i][1]
+        return None
+
+    def overlapping(self, start_date, end_date):
+        """Urlaube, die Tage in [start_date, end_date] belegen, nach Beginn sortiert - O(log n + k)
+
+        Liefert (erster Tag, letzter Tag, Eintrag) je zusammenhängendem Abschnitt,
+        beschnitten auf den Zeitraum.
+        """
+        first = start_date.toordinal()
+        last = end_date.toordinal()
+        i = max(bisect_right(self.segment_starts, first) - 1, 0)
+        result = []
+        while i < len(self.segment_starts) and self.segment_starts[i] <= last:
+            if self.segment_ends[i] >= first:
+                result.append((date.fromordinal(max(self.segment_starts[i], first)),
+                               date.fromordinal(min(self.segment_ends[i], last)),
+                               self.segment_entries[i][1]))
+            i += 1
+        return result
+
+    def starting_between(self, start_date, end_date):
+        """Einträge mit Beginn in [start_date, end_date] als (position, eintrag) - O(log n + k)"""
+        lo = bisect_left(self.entry_starts, start_date.toordinal())
+        hi = bisect_right(self.entry_starts, end_date.toordinal())
+        return [(entry[2], entry[3]) for entry in self.entries[lo:hi]]
+
+    def all_entries(self):
+        """Alle gültigen Einträge nach Beginn sortiert als (position, eintrag)"""
+        return [(entry[2], entry[3]) for entry in self.entries]
+
+    def starting_after(self, check_date):
+        """Einträge mit Beginn nach check_date als (position, eintrag), sortiert - O(log n + k)"""
+        i = bisect_right(self.entry_starts, check_date.toordinal())
+        return ((entry[2], entry[3]) for entry in islice(self.entries, i, None))
+
+    def next_after(self, check_date):
+        """Erster Urlaub, der nach check_date beginnt, oder None - O(log n)"""
+        i = bisect_right(self.entry_starts, check_date.toordinal())
+        if i < len(self.entries):
+            return self.entries[i][3]
+        return None
+
+class CalendarIndex:
+    """Feiertage als Datum→Name und Urlaube als VacationIndex
+
+    Steht ein Jahr in holidays.json, gilt nur die Datei (dort gelöschte
+    Feiertage bleiben gelöscht). Andere Jahre werden bei Bedarf über
+    get_german_holidays berechnet; mit persist=True werden sie in holidays.json
+    gespeichert.
+    """
+
+    def __init__(self, holidays=None, vacations=None, state_code=None, persist=False):
+        self.stored_holidays = load_holidays() if holidays is None else holidays
+        self.holidays = dict(self.stored_holidays)
+        self.stored_years = {key[:4] for key in self.stored_holidays}
+        self.state_code = load_state_code() if state_code is None else state_code
+        self.persist = persist
+        self.loaded_years = set()
+        self.holiday_dates = None
+
+        self.vacations = load_vacations() if vacations is None else vacations
+        self.vacation_index = VacationIndex(self.vacations)
+
+    def load_year(self, year):
+        """Berechne Feiertage eines Jahres, das nicht in holidays.json steht (einmal pro Index)"""
+        if year in self.loaded_years:
+            return
+        self.loaded_years.add(year)
+        if f"{year:04d}" in self.stored_years:
+            return
+
+        from holiday_manager import get_german_holidays
+        computed = get_german_holidays(year, self.state_code)
+        self.holidays.update(computed)
+        self.holiday_dates = None
+
+        if self.persist:
+            from holiday_manager import save_holidays
+            self.stored_holidays = dict(self.stored_holidays)
+            self.stored_holidays.update(computed)
+            save_holidays(self.stored_holidays)
+            self.stored_years.add(f"{year:04d}")
+
+    def holidays_in_year(self, year):
+        """Alle Feiertage eines Jahres als {'YYYY-MM-DD': Name}"""
+        self.load_year(year)
+        prefix = f"{year}-"
+        return {k: v for k, v in self.holidays.items() if k.startswith(prefix)}
+
+    def is_holiday(self, check_date):
+        """Name des Feiertags oder None"""
+        key = date_key(check_date)
+        self.load_year(int(key[:4]))
+        return self.holidays.get(key)
+
+    def is_vacation(self, check_date):
+        """Urlaubseintrag oder None"""
+        if isinstance(check_date, str):
+            check_date = parse_date(check_date)
+        return self.vacation_index.lookup(check_date)
+
+    def _sorted_holiday_dates(self):
+        """Sortierte Feiertagsschlüssel (neu aufgebaut nur nach load_year)"""
+        if self.holiday_dates is None:
+            self.holiday_dates = sorted(self.holidays)
+        return self.holiday_dates
+
+    def iter_holidays_after(self, check_date):
+        """Feiertage nach check_date aufsteigend als (date, Name); Jahre werden nachgeladen"""
+        year = check_date.year
+        key = date_key(check_date)
+        while True:
+            self.load_year(year)
+            dates = self._sorted_holiday_dates()
+            year_end = f"{year}-12-31"
+            i = bisect_right(dates, key)
+            while i < len(dates) and dates[i] <= year_end:
+                yield parse_date(dates[i]), self.holidays[dates[i]]
+                key = dates[i]
+                i += 1
+            key = max(key, year_end)
+            year += 1
+
+    def next_holiday(self, check_date):
+        """Nächster Feiertag nach check_date als (date, Name)"""
+        return next(self.iter_holidays_after(check_date), None)
+
+    def next_vacation(self, check_date):
+        """Nächster Urlaub, der nach check_date beginnt, oder None"""
+        return self.vacation_index.next_after(check_date)
+
+    def upcoming(self, check_date, count):
+        """Die nächsten count besonderen Tage nach check_date aus beiden Quellen
+
+        Liefert (date, 'holiday', Name) bzw. (date, 'vacation', Eintrag), nach Datum
+        sortiert; Urlaube erscheinen einmal mit ihrem ersten Tag.
+        """
+        holidays = ((day, 'holiday', name) for day, name in self.iter_holidays_after(check_date))
+        vacations = ((parse_date(vacation['start']), 'vacation', vacation)
+                     for _, vacation in self.vacation_index.starting_after(check_date))
+        merged = heapq.merge(holidays, vacations, key=lambda x: (x[0], x[1] == 'vacation'))
+        return list(islice(merged, count))
+
+_calendar_index = None
+
+def get_calendar_index(persist=False):
+    """Prozessweiter CalendarIndex (Dateien werden nur einmal gelesen)"""
+    global _calendar_index
+    if _calendar_index is None:
+        _calendar_index = CalendarIndex(persist=persist)
+    return _calendar_index
+
+def load_calendar():
+    """CalendarStore (Binärkopie), oder CalendarIndex, wenn sie fehlt oder sich nicht bauen lässt"""
+    try:
+        import calendar_store
+        try:
+            return calendar_store.open_calendar_store()
+        except calendar_store.STORE_ERRORS:
+            pass
+    except ImportError:
+        pass
+    return CalendarIndex()
+
+def is_holiday(check_date):
+    """Prüfe ob gegebenes Datum ein Feiertag ist"""
+    return get_calendar_index().is_holiday(check_date)
+
+def is_vacation(check_date):
+    """Prüfe ob gegebenes Datum ein Urlaubstag ist"""
+    return get_calendar_index().is_vacation(check_date)
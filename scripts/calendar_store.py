@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Calendar Store
+Kompakte Binärkopie von Feiertagen und Urlauben (Bitset pro Jahr + Stringtabelle), per mmap gelesen
+
+holidays.json und vacation.json (+ Journal) bleiben die editierbare Quelle; die Binärdatei
+wird neu erzeugt, sobald sich eine der Quelldateien ändert. Die Binärdatei ist nur ein
+Cache: Jahre außerhalb von YEAR_WINDOW um das aktuelle Jahr und jeder Fehler beim Bauen
+oder Lesen (STORE_ERRORS) führen zu calendar_index zurück (siehe load_calendar dort).
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import date
+
+from calendar_index import CalendarIndex, SOURCE_FILES, source_signature
+
+STORE_FILE = os.path.expanduser('~/.timewarrior/data/cache/calendar.bin')
+
+MAGIC = b'TWCS'
+VERSION = 2
+
+# Gespeicherte Jahre höchstens so weit um das aktuelle Jahr (Tippfehler wie 2205
+# in vacation.json blähen die Datei sonst auf); andere Jahre über CalendarIndex
+YEAR_WINDOW = 10
+
+# Fehler beim Bauen/Lesen der Binärdatei; dann gilt CalendarIndex
+STORE_ERRORS = (OSError, ValueError, TypeError, KeyError, OverflowError, struct.error)
+
+# magic, version, erstes Jahr, Anzahl Jahre, Anzahl Strings,
+# Offsets (Feiertags-Indizes, Urlaubs-Indizes, Stringtabelle), Quellsignatur
+HEADER = struct.Struct('<4sHHHIIII' + 'qq' * len(SOURCE_FILES))
+
+# Pro Jahr: Rang-Basis Feiertage, Rang-Basis Urlaub, Bitset Feiertage, Bitset Urlaub
+BITSET_BYTES = 46  # 366 Tage
+YEAR_RECORD = struct.Struct(f'<II{BITSET_BYTES}s{BITSET_BYTES}s')
+
+NAME_INDEX = struct.Struct('<H')
+STRING_OFFSET = struct.Struct('<I')
+
+def _popcount(data):
+    """Anzahl gesetzter Bits"""
+    return bin(int.from_bytes(data, 'little')).count('1')
+
+def build_store(index=None, first_year=None, last_year=None, store_file=STORE_FILE):
+    """Schreibe Binärdatei aus einem CalendarIndex (atomar über os.replace)
+
+    Berechnete Jahre landen nur im Cache, nicht in holidays.json: dort gelten
+    Einträge als Benutzerdaten und hätten nach --set-state weiter Vorrang.
+    """
+    if index is None:
+        index = CalendarIndex()
+
+    today = date.today()
+    years = {today.year - 1, today.year, today.year + 1}
+    years.update(int(key[:4]) for key in index.stored_holidays)
+    for start, end, _, _ in index.vacation_index.entries:
+        years.update((date.fromordinal(start).year, date.fromordinal(end).year))
+    if first_year is None:
+        first_year = max(min(years), today.year - YEAR_WINDOW)
+    if last_year is None:
+        last_year = min(max(years), today.year + YEAR_WINDOW)
+
+    strings = []
+    string_ids = {}
+
+    def string_id(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    records = []
+    holiday_ids = []
+    vacation_ids = []
+    for year in range(first_year, last_year + 1):
+        holiday_bits = bytearray(BITSET_BYTES)
+        vacation_bits = bytearray(BITSET_BYTES)
+        holiday_base = len(holiday_ids)
+        vacation_base = len(vacation_ids)
+
+        first = date(year, 1, 1).toordinal()
+        for doy in range(date(year, 12, 31).toordinal() - first + 1):
+            day = date.fromordinal(first + doy)
+            holiday = index.is_holiday(day)
+            if holiday:
+                holiday_bits[doy >> 3] |= 1 << (doy & 7)
+                holiday_ids.append(string_id(holiday))
+            vacation = index.is_vacation(day)
+            if vacation:
+                vacation_bits[doy >> 3] |= 1 << (doy & 7)
+                vacation_ids.append(string_id(json.dumps(vacation, ensure_ascii=False, sort_keys=True)))
+
+        records.append(YEAR_RECORD.pack(holiday_base, vacation_base, bytes(holiday_bits), bytes(vacation_bits)))
+
+    encoded = [value.encode('utf-8') for value in strings]
+    holiday_offset = HEADER.size + YEAR_RECORD.size * len(records)
+    vacation_offset = holiday_offset + NAME_INDEX.size * len(holiday_ids)
+    strings_offset = vacation_offset + NAME_INDEX.size * len(vacation_ids)
+
+    header = HEADER.pack(MAGIC, VERSION, first_year, len(records), len(strings),
+                         holiday_offset, vacation_offset, strings_offset, *source_signature())
+
+    offsets = []
+    position = 0
+    for value in encoded:
+        offsets.append(position)
+        position += len(value)
+    offsets.append(position)
+
+    os.makedirs(os.path.dirname(store_file), exist_ok=True)
+    tmp_file = f"{store_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(header)
+        f.writelines(records)
+        f.write(b''.join(NAME_INDEX.pack(i) for i in holiday_ids))
+        f.write(b''.join(NAME_INDEX.pack(i) for i in vacation_ids))
+        f.write(b''.join(STRING_OFFSET.pack(o) for o in offsets))
+        f.write(b''.join(encoded))
+    os.replace(tmp_file, store_file)
+
+class CalendarStore:
+    """Lesezugriff auf die Binärdatei; Jahre außerhalb des Bereichs über CalendarIndex"""
+
+    def __init__(self, store_file=STORE_FILE):
+        with open(store_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        fields = HEADER.unpack_from(self.data, 0)
+        (magic, version, self.first_year, self.year_count, self.string_count,
+         self.holiday_offset, self.vacation_offset, self.strings_offset) = fields[:8]
+        self.signature = tuple(fields[8:])
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unbekanntes Format: {store_file}")
+
+        self.fallback = None
+
+    def covers(self, year):
+        """Liegt das Jahr im gespeicherten Bereich?"""
+        return self.first_year <= year < self.first_year + self.year_count
+
+    def _string(self, string_id):
+        position = self.strings_offset + STRING_OFFSET.size * string_id
+        start, end = struct.unpack_from('<II', self.data, position)
+        base = self.strings_offset + STRING_OFFSET.size * (self.string_count + 1)
+        return self.data[base + start:base + end].decode('utf-8')
+
+    def _lookup(self, check_date, field, array_offset):
+        """String-ID des Tages über Bitset + Rang, oder None (field: 0 = Feiertage, 1 = Urlaub)"""
+        record = HEADER.size + YEAR_RECORD.size * (check_date.year - self.first_year)
+        bitset = record + 8 + BITSET_BYTES * field
+        doy = check_date.timetuple().tm_yday - 1
+
+        if not self.data[bitset + (doy >> 3)] & (1 << (doy & 7)):
+            return None
+
+        rank = _popcount(self.data[bitset:bitset + (doy >> 3)])
+        rank += _popcount(bytes([self.data[bitset + (doy >> 3)] & ((1 << (doy & 7)) - 1)]))
+        base = struct.unpack_from('<I', self.data, record + 4 * field)[0]
+        return NAME_INDEX.unpack_from(self.data, array_offset + NAME_INDEX.size * (base + rank))[0]
+
+    def _fallback(self):
+        if self.fallback is None:
+            self.fallback = CalendarIndex()
+        return self.fallback
+
+    def is_holiday(self, check_date):
+        """Name des Feiertags oder None"""
+        if not self.covers(check_date.year):
+            return self._fallback().is_holiday(check_date)
+        string_id = self._lookup(check_date, 0, self.holiday_offset)
+        return None if string_id is None else self._string(string_id)
+
+    def is_vacation(self, check_date):
+        """Urlaubseintrag oder None"""
+        if not self.covers(check_date.year):
+            return self._fallback().is_vacation(check_date)
+        string_id = self._lookup(check_date, 1, self.vacation_offset)
+        return None if string_id is None else json.loads(self._string(string_id))
+
+def open_calendar_store(store_file=STORE_FILE):
+    """Öffne Binärdatei; neu erzeugen, wenn sie fehlt, veraltet ist oder das aktuelle Jahr fehlt"""
+    try:
+        store = CalendarStore(store_file)
+        if store.signature == source_signature() and store.covers(date.today().year):
+            return store
+    except STORE_ERRORS:
+        pass
+
+    build_store(store_file=store_file)
+    return CalendarStore(store_file)
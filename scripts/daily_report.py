@@ -4,90 +4,19 @@ Timewarrior Daily Report
 Detaillierter Tagesbericht mit Feiertagserkennung
 """
 
-import subprocess
-import json
-import os
 from datetime import datetime, date, timedelta
-import argparse
 
-def load_holidays():
-    """Lade Feiertage aus lokaler Datei"""
-    holidays_file = os.path.expanduser('~/.timewarrior/data/holidays/holidays.json')
-    try:
-        with open(holidays_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return {}
+from aggregation import aggregate
+from calendar_index import is_holiday, is_vacation
+from timew_data import get_interval_table, partition_table, rebuild_interval_cache
 
-def load_vacations():
-    """Lade Urlaubsdaten aus lokaler Datei"""
-    vacation_file = os.path.expanduser('~/.timewarrior/data/vacation/vacation.json')
-    try:
-        with open(vacation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
-
-def is_holiday(check_date):
-    """Prüfe ob gegebenes Datum ein Feiertag ist"""
-    holidays = load_holidays()
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    return holidays.get(date_str, None)
-
-def is_vacation(check_date):
-    """Prüfe ob gegebenes Datum ein Urlaubstag ist"""
-    vacations = load_vacations()
+def get_timewarrior_data(date_str, export_data=None):
+    """Hole Timewarrior-Daten für gegebenes Datum (export_data: bereits geladene Intervalle)"""
+    if export_data is None:
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+        export_data = get_interval_table(date_obj, date_obj)
     
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    
-    for vacation in vacations:
-        if vacation['start'] <= date_str <= vacation['end']:
-            return vacation
-    return None
-
-def get_timewarrior_data(date_str):
-    """Hole Timewarrior-Daten für gegebenes Datum"""
-    try:
-        # Hole summary für den Tag
-        result = subprocess.run(['timew', 'summary', date_str, ':ids'], 
-                              capture_output=True, text=True, check=True)
-        
-        # Hole export für detaillierte Daten
-        export_result = subprocess.run(['timew', 'export', date_str], 
-                                     capture_output=True, text=True, check=True)
-        
-        summary_lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-        
-        # Parse Export JSON
-        export_data = []
-        if export_result.stdout.strip():
-            try:
-                export_data = json.loads(export_result.stdout)
-            except:
-                export_data = []
-        
-        return summary_lines, export_data
-        
-    except subprocess.CalledProcessError:
-        return [], []
-
-def parse_total_time(summary_lines):
-    """Extrahiere Gesamtzeit aus Summary"""
-    for line in summary_lines:
-        if 'Total' in line:
-            parts = line.split()
-            for part in parts:
-                if ':' in part:  # Format HH:MM
-                    return part
-                elif 'h' in part:  # Format Xh oder X.Xh
-                    return part
-    return "0:00"
+    return export_data
 
 def format_duration(seconds):
     """Formatiere Sekunden zu HH:MM"""
@@ -98,8 +27,8 @@ def format_duration(seconds):
     minutes = int((seconds % 3600) // 60)
     return f"{hours}:{minutes:02d}"
 
-def generate_daily_report(target_date):
-    """Generiere detaillierten Tagesbericht"""
+def generate_daily_report(target_date, export_data=None):
+    """Generiere detaillierten Tagesbericht (export_data: bereits geladene Intervalle des Tages)"""
     
     if isinstance(target_date, str):
         date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
@@ -133,57 +62,33 @@ def generate_daily_report(target_date):
         return
     
     # Hole Timewarrior-Daten
-    summary_lines, export_data = get_timewarrior_data(date_str)
+    export_data = get_timewarrior_data(date_str, export_data)
     
     if not export_data:
         print("📭 Keine Zeiterfassung für diesen Tag")
         print(f"{'='*80}")
         return
     
-    # Gesamtzeit
-    total_time = parse_total_time(summary_lines)
-    print(f"⏰ GESAMTARBEITSZEIT: {total_time}")
-    print(f"{'='*80}")
-    
-    # Detaillierte Aufschlüsselung nach Projekten/Tags
-    projects = {}
-    total_seconds = 0
+    # Detaillierte Aufschlüsselung nach Projekten/Tags (aktiver Eintrag zählt bis jetzt,
+    # Intervalle über Mitternacht nur mit dem Anteil dieses Tages)
+    summary = aggregate(export_data, days=[date_obj], include_active=True, keep_entries=True)
+    total_seconds = summary.total
     
-    for entry in export_data:
-        if 'end' not in entry:  # Aktive Einträge überspringen für Tagesbericht
-            continue
-            
-        start = datetime.fromisoformat(entry['start'].replace('Z', '+00:00'))
-        end = datetime.fromisoformat(entry['end'].replace('Z', '+00:00'))
-        duration = (end - start).total_seconds()
-        total_seconds += duration
-        
-        # Projektname aus Tags
-        tags = entry.get('tags', [])
-        project = tags[0] if tags else 'Ohne Projekt'
-        
-        if project not in projects:
-            projects[project] = {'duration': 0, 'entries': []}
-        
-        projects[project]['duration'] += duration
-        projects[project]['entries'].append({
-            'start': start,
-            'end': end,
-            'duration': duration,
-            'tags': tags
-        })
+    # Gesamtzeit (aus denselben Intervallen wie die Projektaufschlüsselung)
+    print(f"⏰ GESAMTARBEITSZEIT: {format_duration(total_seconds)}")
+    print(f"{'='*80}")
     
     # Zeige Projekte sortiert nach Dauer
-    if projects:
+    if summary.projects:
         print("📋 AUFSCHLÜSSELUNG NACH PROJEKTEN:")
         print(f"{'-'*80}")
         print(f"{'Projekt':<30} {'Zeit':<10} {'Anteil':<8} {'Einträge'}")
         print(f"{'-'*80}")
         
-        for project, data in sorted(projects.items(), key=lambda x: x[1]['duration'], reverse=True):
-            duration_str = format_duration(data['duration'])
-            percentage = (data['duration'] / total_seconds * 100) if total_seconds > 0 else 0
-            entry_count = len(data['entries'])
+        for project, duration in summary.top_projects():
+            duration_str = format_duration(duration)
+            percentage = (duration / total_seconds * 100) if total_seconds > 0 else 0
+            entry_count = summary.project_entries[project]
             
             print(f"{project:<30} {duration_str:<10} {percentage:6.1f}% {entry_count:2d}x")
     
@@ -195,19 +100,13 @@ def generate_daily_report(target_date):
     print(f"{'Zeit':<15} {'Dauer':<8} {'Projekt/Tags'}")
     print(f"{'-'*80}")
     
-    sorted_entries = []
-    for project, data in projects.items():
-        for entry in data['entries']:
-            sorted_entries.append((entry, project))
-    
     # Sortiere nach Startzeit
-    sorted_entries.sort(key=lambda x: x[0]['start'])
-    
-    for entry, project in sorted_entries:
-        start_time = entry['start'].strftime('%H:%M')
-        end_time = entry['end'].strftime('%H:%M')
-        duration_str = format_duration(entry['duration'])
-        tags_str = ', '.join(entry['tags']) if entry['tags'] else project
+    to_local = summary.calendar.to_datetime
+    for entry in sorted(summary.entries, key=lambda row: row.start):
+        start_time = to_local(entry.start).strftime('%H:%M')
+        end_time = 'jetzt' if entry.active else to_local(entry.end).strftime('%H:%M')
+        duration_str = format_duration(entry.duration)
+        tags_str = ', '.join(entry.tags) if entry.tags else entry.project
         
         print(f"{start_time}-{end_time:<8} {duration_str:<8} {tags_str}")
     
@@ -232,19 +131,26 @@ def generate_daily_report(target_date):
     print(f"{'='*80}\n")
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description='Timewarrior Daily Report')
     parser.add_argument('date', nargs='?', help='Datum (YYYY-MM-DD), Standard: heute')
     parser.add_argument('--yesterday', action='store_true', help='Gestern anzeigen')
     parser.add_argument('--week', action='store_true', help='Letzte 7 Tage anzeigen')
+    parser.add_argument('--rebuild-cache', action='store_true', help='Intervall-Cache neu aufbauen')
     
     args = parser.parse_args()
     
+    if args.rebuild_cache:
+        rebuild_interval_cache()
+    
     if args.week:
-        # Zeige letzte 7 Tage
+        # Zeige letzte 7 Tage - ein Abruf für den ganzen Zeitraum
         today = date.today()
-        for i in range(6, -1, -1):
-            target_date = today - timedelta(days=i)
-            generate_daily_report(target_date)
+        days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        export_data = get_interval_table(days[0], days[-1])
+        
+        for target_date, day_data in zip(days, partition_table(export_data, [(d, d) for d in days])):
+            generate_daily_report(target_date, day_data)
     elif args.yesterday:
         yesterday = date.today() - timedelta(days=1)
         generate_daily_report(yesterday)
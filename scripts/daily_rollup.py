@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Daily Rollup
+Arbeitszeit pro Tag für die Hooks, inkrementell aus den Hook-Eingaben fortgeschrieben
+
+Die Rollup-Datei merkt sich die Intervalle der letzten Tage (Start → Ende),
+die Summe abgeschlossener Intervalle pro lokalem Tag und das letzte Arbeitsende
+pro Arbeitstag (Tag des Intervallbeginns) für die Ruhezeitprüfung. Ein geändertes
+Intervall ersetzt seinen alten Beitrag. Heute und gestern werden einmal pro Tag
+aus den Datendateien befüllt (timew_data.read_intervals, kein `timew`-Aufruf);
+danach kommen die Hook-Intervalle als Delta dazu. Neu eingelesen wird nur, wenn
+sich die Datendateien anders ändern als durch den letzten Hook-Aufruf erwartet.
+Tage sind lokale Tage der konfigurierten Zeitzone (local_time), wie in den Berichten.
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+
+from local_time import local_days
+from timestamps import parse_epoch
+
+ROLLUP_FILE = os.path.expanduser('~/.timewarrior/data/cache/daily_rollup.json')
+
+VERSION = 4
+
+# Wie viele Tage Intervalle und Summen aufbewahrt werden
+KEEP_DAYS = 14
+
+def parse_timestamp(value):
+    """Timewarrior-Zeitstempel zu datetime (UTC)"""
+    return datetime.fromtimestamp(parse_epoch(value), timezone.utc)
+
+def split_by_day(start, end):
+    """Sekunden eines Intervalls pro lokalem Tag als [('YYYY-MM-DD', sekunden), ...]"""
+    return [(day.isoformat(), part_end - part_start)
+            for day, part_start, part_end in local_days().split(start.timestamp(), end.timestamp())]
+
+def load_rollup(rollup_file=ROLLUP_FILE):
+    """Lade Rollup (leer bei fehlender/veralteter Datei)"""
+    try:
+        with open(rollup_file, 'r', encoding='utf-8') as f:
+            rollup = json.load(f)
+        if rollup.get('version') == VERSION:
+            return rollup
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {'version': VERSION, 'seeded': None, 'intervals': {}, 'days': {}, 'last_end': {}}
+
+def save_rollup(rollup, rollup_file=ROLLUP_FILE):
+    """Schreibe Rollup atomar"""
+    os.makedirs(os.path.dirname(rollup_file), exist_ok=True)
+    tmp_file = f"{rollup_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(rollup, f)
+    os.replace(tmp_file, rollup_file)
+
+def _add(days, start, end, sign):
+    for day, seconds in split_by_day(parse_timestamp(start), parse_timestamp(end)):
+        days[day] = days.get(day, 0) + sign * seconds
+
+def workday(start):
+    """Arbeitstag eines Intervalls: lokaler Tag seines Beginns"""
+    return local_days().day_of(parse_epoch(start)).isoformat()
+
+def _update_last_end(rollup, start, old_end, end):
+    """Letztes Arbeitsende des Arbeitstags fortschreiben"""
+    last_end = rollup['last_end']
+    day = workday(start)
+    current = last_end.get(day)
+    if end and (current is None or end > current):
+        last_end[day] = end
+    elif old_end and old_end == current:
+        # Das bisherige Maximum wurde verkürzt/geöffnet: Tag neu bestimmen (selten)
+        ends = [e for s, e in rollup['intervals'].items() if e and workday(s) == day]
+        if ends:
+            last_end[day] = max(ends)
+        else:
+            last_end.pop(day, None)
+
+def _set_interval(rollup, start, end):
+    """Setze ein Intervall (end=None: laufend) und ersetze seinen alten Beitrag"""
+    known = rollup['intervals']
+    old_end = known.get(start)
+    if old_end == end and start in known:
+        return
+    if old_end:
+        _add(rollup['days'], start, old_end, -1)
+    if end:
+        _add(rollup['days'], start, end, 1)
+    known[start] = end
+    _update_last_end(rollup, start, old_end, end)
+
+def _remove_interval(rollup, start):
+    """Entferne ein Intervall samt Beitrag"""
+    old_end = rollup['intervals'].pop(start)
+    if old_end:
+        _add(rollup['days'], start, old_end, -1)
+    _update_last_end(rollup, start, old_end, None)
+
+def _supersede(rollup, start, end):
+    """Einträge, die das Intervall (start, end) ersetzt
+
+    Die Datendateien zeigen während des Hooks noch den alten Stand: ein
+    abgeschlossenes Intervall mit gleichem Ende hat nur einen neuen Beginn
+    (`timew modify start`). Es läuft nur ein Intervall; ein später begonnenes
+    laufendes wurde nach vorn verschoben, ein früher begonnenes endet mit dem
+    neuen Beginn.
+    """
+    for other, other_end in list(rollup['intervals'].items()):
+        if other == start:
+            continue
+        if end is not None and other_end == end:
+            _remove_interval(rollup, other)
+        elif end is None and other_end is None:
+            if other > start:
+                _remove_interval(rollup, other)
+            else:
+                _set_interval(rollup, other, start)
+
+def apply_intervals(rollup, intervals):
+    """Übernimm Intervalle (Schlüssel: Start); alter Beitrag wird ersetzt - O(Intervalle)"""
+    for interval in intervals:
+        if not isinstance(interval, dict) or 'start' not in interval:
+            continue
+        start = interval['start']
+        end = interval.get('end')
+        if rollup['intervals'].get(start, 0) != end:
+            _supersede(rollup, start, end)
+        _set_interval(rollup, start, end)
+
+def data_file_name(stamp):
+    """Monatsdatei, in die Timewarrior ein Intervall schreibt ('YYYY-MM.data')"""
+    return f"{stamp[:4]}-{stamp[4:6]}.data"
+
+def _expected_change(seeded, signature):
+    """Passt die Änderung der Datendateien zum Schreiben nach dem letzten Hook-Aufruf?
+
+    Nur die erwarteten Monatsdateien dürfen sich geändert haben, und keine ist
+    kleiner geworden: Timewarrior ergänzt oder beendet dort ein Intervall,
+    gelöschte oder gekürzte Einträge verkleinern die Datei.
+    """
+    old = {name: (mtime, size) for name, mtime, size in seeded['files']}
+    new = {name: (mtime, size) for name, mtime, size in signature}
+    if old.keys() - new.keys():
+        return False
+    pending = set(seeded['pending'])
+    for name, (mtime, size) in new.items():
+        if name in pending:
+            if size < old.get(name, (0, 0))[1]:
+                return False
+        elif old.get(name) != (mtime, size):
+            return False
+    return True
+
+def seed_day(rollup, day, data_dir=None):
+    """Befülle den Tag (und den Vortag für die Ruhezeit) aus den Datendateien
+
+    Einmal pro Tag und erneut, wenn sich Monatsdateien (mtime/Größe) ohne Hook
+    ändern: gelöschte, ohne Hook beendete oder verschobene Intervalle würden
+    sonst bis zum nächsten Tag weiterzählen. Das Schreiben, das auf einen
+    Hook-Aufruf folgt, ist schon als Delta enthalten und löst kein Einlesen aus.
+    """
+    # Datenleser erst hier laden
+    from timew_data import DATA_DIR, data_signature, read_intervals
+    data_dir = data_dir or DATA_DIR
+    first_day = day - timedelta(days=1)
+    try:
+        signature = data_signature(first_day, day, data_dir)
+    except OSError:
+        signature = None
+
+    seeded = rollup['seeded']
+    if seeded and seeded['day'] == day.isoformat() and signature is not None and seeded['files'] is not None:
+        if seeded['files'] == signature:
+            return
+        if _expected_change(seeded, signature):
+            seeded.update(files=signature, pending=[])
+            return
+
+    try:
+        intervals = read_intervals(first_day, day, data_dir)
+    except (ValueError, OSError):
+        intervals = []
+
+    rollup.update(seeded={'day': day.isoformat(), 'files': signature, 'pending': []},
+                  intervals={}, days={}, last_end={})
+    apply_intervals(rollup, intervals)
+
+def expect_write(rollup, intervals):
+    """Merke die Monatsdateien, die Timewarrior nach diesem Hook-Aufruf schreibt"""
+    pending = set(rollup['seeded']['pending'])
+    for interval in intervals:
+        if isinstance(interval, dict) and 'start' in interval:
+            pending.add(data_file_name(interval['start']))
+    rollup['seeded']['pending'] = sorted(pending)
+
+def prune(rollup, today):
+    """Verwerfe Intervalle und Tage, die älter als KEEP_DAYS sind"""
+    cutoff = today - timedelta(days=KEEP_DAYS)
+    cutoff_key = cutoff.isoformat()
+    cutoff_stamp = cutoff.strftime('%Y%m%dT000000Z')
+
+    rollup['intervals'] = {start: end for start, end in rollup['intervals'].items()
+                           if start >= cutoff_stamp or end is None or end >= cutoff_stamp}
+    rollup['days'] = {day: seconds for day, seconds in rollup['days'].items() if day >= cutoff_key}
+    rollup['last_end'] = {day: end for day, end in rollup['last_end'].items() if day >= cutoff_key}
+
+def day_seconds(rollup, day, now=None):
+    """Arbeitszeit eines Tages in Sekunden; laufende Intervalle zählen bis jetzt"""
+    now = now or datetime.now(timezone.utc)
+    key = day.isoformat()
+    total = rollup['days'].get(key, 0)
+    for start, end in rollup['intervals'].items():
+        if end is None:
+            for part_day, seconds in split_by_day(parse_timestamp(start), now):
+                if part_day == key:
+                    total += seconds
+    return max(total, 0)
+
+def rest_before(rollup, start):
+    """Ruhezeit vor einem Intervall als timedelta, oder None - O(1)
+
+    Nur für das erste Intervall eines Arbeitstags: Abstand zum letzten
+    Arbeitsende des Vortags.
+    """
+    day = local_days().day_of(parse_epoch(start))
+    earlier_today = rollup['last_end'].get(day.isoformat())
+    if earlier_today and earlier_today <= start:
+        return None
+
+    previous_end = rollup['last_end'].get((day - timedelta(days=1)).isoformat())
+    if previous_end is None or previous_end > start:
+        return None
+    return parse_timestamp(start) - parse_timestamp(previous_end)
+
+def update_rollup(intervals, today=None, rollup_file=ROLLUP_FILE):
+    """Schreibe das Rollup mit den Hook-Intervallen (Delta) fort und speichere es"""
+    today = today or date.today()
+    rollup = load_rollup(rollup_file)
+    seed_day(rollup, today)
+    apply_intervals(rollup, intervals)
+    expect_write(rollup, intervals)
+    prune(rollup, today)
+    save_rollup(rollup, rollup_file)
+    return rollup
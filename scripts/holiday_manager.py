@@ -6,9 +6,8 @@ Verwaltet deutsche Feiertage mit Bundesland-spezifischen Feiertagen
 
 import json
 import os
-import argparse
 from datetime import datetime, date, timedelta
-import subprocess
+from functools import lru_cache
 
 # Deutsche Bundesländer
 BUNDESLAENDER = {
@@ -30,6 +29,16 @@ BUNDESLAENDER = {
     'TH': 'Thüringen'
 }
 
+# Namensbestandteile regionaler (nicht bundesweiter) Feiertage
+REGIONAL_HOLIDAY_MARKERS = (
+    "Heilige Drei Könige", "Fronleichnam", "Mariä Himmelfahrt", "Reformationstag",
+    "Allerheiligen", "Buß- und Bettag", "Frauentag", "regional",
+)
+
+def is_regional_holiday(name):
+    """Ist der Feiertag regional (nicht bundesweit)?"""
+    return any(marker in name for marker in REGIONAL_HOLIDAY_MARKERS)
+
 def get_config_dir():
     """Hole Konfigurationsverzeichnis"""
     return os.path.expanduser('~/.timewarrior/data/config')
@@ -78,82 +87,133 @@ def calculate_easter(year):
     
     return date(year, month, day)
 
-def get_german_holidays(year, state_code=None):
-    """Erstelle deutsche Feiertage für gegebenes Jahr und Bundesland"""
-    holidays = {}
+# Feste Feiertage: (Monat, Tag, Name, Bundesländer oder None für bundesweit, ab Jahr)
+FIXED_HOLIDAYS = [
+    (1, 1, "Neujahr", None, None),
+    (5, 1, "Tag der Arbeit", None, None),
+    (10, 3, "Tag der Deutschen Einheit", None, None),
+    (12, 25, "1. Weihnachtsfeiertag", None, None),
+    (12, 26, "2. Weihnachtsfeiertag", None, None),
+    (1, 6, "Heilige Drei Könige", {'BW', 'BY', 'ST'}, None),
+    (8, 15, "Mariä Himmelfahrt", {'BY', 'SL'}, None),
+    (10, 31, "Reformationstag", {'BB', 'HB', 'HH', 'MV', 'NI', 'SN', 'ST', 'SH', 'TH'}, None),
+    (11, 1, "Allerheiligen", {'BW', 'BY', 'NW', 'RP', 'SL'}, None),
+    # Berliner Spezialität: Internationaler Frauentag seit 2019
+    (3, 8, "Internationaler Frauentag", {'BE'}, 2019),
+]
+
+# Bewegliche Feiertage: (Tage relativ zu Ostersonntag, Name, Bundesländer oder None)
+EASTER_HOLIDAYS = [
+    (-2, "Karfreitag", None),
+    (1, "Ostermontag", None),
+    (39, "Christi Himmelfahrt", None),
+    (50, "Pfingstmontag", None),
+    (60, "Fronleichnam", {'BW', 'BY', 'HE', 'NW', 'RP', 'SL'}),
+    # Erweitert: Fronleichnam auch in Teilen von Sachsen und Thüringen
+    (60, "Fronleichnam (regional)", {'SN', 'TH'}),
+]
+
+def calculate_buss_und_bettag(year):
+    """Buß- und Bettag: Mittwoch vor dem 23. November"""
+    nov_23 = date(year, 11, 23)
+    days_back = (nov_23.weekday() - 2) % 7
+    if days_back == 0:
+        days_back = 7
+    return nov_23 - timedelta(days=days_back)
+
+def get_year_rules(year):
+    """Alle Feiertage eines Jahres als (Datum, Name, Bundesländer oder None)
+
+    Ostern und alle davon abhängigen Daten werden nur einmal pro Jahr berechnet.
+    """
+    rules = []
     
-    # Bundesweite Feiertage
-    holidays[f"{year}-01-01"] = "Neujahr"
-    holidays[f"{year}-05-01"] = "Tag der Arbeit"
-    holidays[f"{year}-10-03"] = "Tag der Deutschen Einheit"
-    holidays[f"{year}-12-25"] = "1. Weihnachtsfeiertag"
-    holidays[f"{year}-12-26"] = "2. Weihnachtsfeiertag"
+    for month, day, name, states, since in FIXED_HOLIDAYS:
+        if since is None or year >= since:
+            rules.append((f"{year}-{month:02d}-{day:02d}", name, states))
     
-    # Berechne bewegliche Feiertage basierend auf Ostern
     easter = calculate_easter(year)
+    for offset, name, states in EASTER_HOLIDAYS:
+        rules.append(((easter + timedelta(days=offset)).isoformat(), name, states))
     
-    # Karfreitag (2 Tage vor Ostern) - bundesweit
-    karfreitag = easter - timedelta(days=2)
-    holidays[karfreitag.strftime('%Y-%m-%d')] = "Karfreitag"
+    # Buß- und Bettag - nur Sachsen
+    rules.append((calculate_buss_und_bettag(year).isoformat(), "Buß- und Bettag", {'SN'}))
     
-    # Ostermontag (1 Tag nach Ostern) - bundesweit
-    ostermontag = easter + timedelta(days=1)
-    holidays[ostermontag.strftime('%Y-%m-%d')] = "Ostermontag"
+    return rules
+
+def apply_year_rules(rules, state_code):
+    """Wende Feiertagsregeln eines Jahres auf ein Bundesland an (None = nur bundesweit)"""
+    holidays = {}
+    for date_str, name, states in rules:
+        if states is None or (state_code and state_code in states):
+            holidays[date_str] = name
+    return holidays
+
+def get_german_holidays(year, state_code=None):
+    """Erstelle deutsche Feiertage für gegebenes Jahr und Bundesland (pro Jahr/Bundesland gecacht)"""
+    return dict(_compute_german_holidays(year, state_code))
+
+@lru_cache(maxsize=128)
+def _compute_german_holidays(year, state_code):
+    """Berechne Feiertage einmal pro (Jahr, Bundesland) und Prozess"""
+    return tuple(sorted(apply_year_rules(get_year_rules(year), state_code).items()))
+
+def compute_holiday_table(years, state_codes):
+    """Berechne Feiertage für viele Jahre und Bundesländer in einem Durchlauf
+
+    Liefert {Bundesland: {'YYYY-MM-DD': Name}}.
+    """
+    table = {state_code: {} for state_code in state_codes}
+    for year in years:
+        rules = get_year_rules(year)
+        for state_code in state_codes:
+            table[state_code].update(apply_year_rules(rules, state_code))
+    return table
+
+def save_holiday_table(table, years, table_file=None):
+    """Speichere kompakte Feiertagstabelle pro Bundesland (Namen als Indexliste)"""
+    holidays_dir = os.path.expanduser('~/.timewarrior/data/holidays')
+    os.makedirs(holidays_dir, exist_ok=True)
     
-    # Christi Himmelfahrt (39 Tage nach Ostern) - bundesweit
-    himmelfahrt = easter + timedelta(days=39)
-    holidays[himmelfahrt.strftime('%Y-%m-%d')] = "Christi Himmelfahrt"
+    if table_file is None:
+        table_file = os.path.join(holidays_dir, 'holidays_table.json')
     
-    # Pfingstmontag (50 Tage nach Ostern) - bundesweit
-    pfingstmontag = easter + timedelta(days=50)
-    holidays[pfingstmontag.strftime('%Y-%m-%d')] = "Pfingstmontag"
+    names = []
+    name_ids = {}
+    states = {}
+    for state_code, holidays in table.items():
+        entries = {}
+        for date_str, name in sorted(holidays.items()):
+            if name not in name_ids:
+                name_ids[name] = len(names)
+                names.append(name)
+            entries[date_str] = name_ids[name]
+        states[state_code] = entries
     
-    # Regionale Feiertage basierend auf Bundesland
-    if state_code:
-        
-        # Heilige Drei Könige (6. Januar)
-        if state_code in ['BW', 'BY', 'ST']:
-            holidays[f"{year}-01-06"] = "Heilige Drei Könige"
-        
-        # Fronleichnam (60 Tage nach Ostern)
-        if state_code in ['BW', 'BY', 'HE', 'NW', 'RP', 'SL']:
-            fronleichnam = easter + timedelta(days=60)
-            holidays[fronleichnam.strftime('%Y-%m-%d')] = "Fronleichnam"
-        
-        # Erweitert: Fronleichnam auch in Teilen von Sachsen und Thüringen
-        if state_code in ['SN', 'TH']:
-            fronleichnam = easter + timedelta(days=60)
-            holidays[fronleichnam.strftime('%Y-%m-%d')] = "Fronleichnam (regional)"
-        
-        # Mariä Himmelfahrt (15. August)
-        if state_code in ['BY', 'SL']:
-            holidays[f"{year}-08-15"] = "Mariä Himmelfahrt"
-        
-        # Reformationstag (31. Oktober)
-        if state_code in ['BB', 'HB', 'HH', 'MV', 'NI', 'SN', 'ST', 'SH', 'TH']:
-            holidays[f"{year}-10-31"] = "Reformationstag"
-        
-        # Allerheiligen (1. November)  
-        if state_code in ['BW', 'BY', 'NW', 'RP', 'SL']:
-            holidays[f"{year}-11-01"] = "Allerheiligen"
-        
-        # Buß- und Bettag (Mittwoch vor dem 23. November) - nur Sachsen
-        if state_code == 'SN':
-            # Finde Mittwoch vor dem 23. November
-            nov_23 = date(year, 11, 23)
-            days_back = (nov_23.weekday() - 2) % 7
-            if days_back == 0:
-                days_back = 7
-            buss_bettag = nov_23 - timedelta(days=days_back)
-            holidays[buss_bettag.strftime('%Y-%m-%d')] = "Buß- und Bettag"
-        
-        # Berliner Spezialitäten
-        if state_code == 'BE':
-            # Internationaler Frauentag (8. März) - seit 2019
-            if year >= 2019:
-                holidays[f"{year}-03-08"] = "Internationaler Frauentag"
+    with open(table_file, 'w', encoding='utf-8') as f:
+        json.dump({'years': [years[0], years[-1]], 'names': names, 'states': states},
+                  f, ensure_ascii=False, separators=(',', ':'))
     
-    return holidays
+    return table_file
+
+def parse_year_range(value):
+    """Parse 'YYYY' oder 'YYYY-YYYY' zu einer Liste von Jahren"""
+    first, _, last = value.partition('-')
+    first = int(first)
+    last = int(last) if last else first
+    if last < first:
+        raise ValueError(f"Ungültiger Jahresbereich: {value}")
+    return list(range(first, last + 1))
+
+def parse_states(value):
+    """Parse 'ALL' oder 'BY,BW,...' zu einer Liste von Bundesländern"""
+    if value.upper() == 'ALL':
+        return list(BUNDESLAENDER)
+    state_codes = [code.strip().upper() for code in value.split(',') if code.strip()]
+    invalid = [code for code in state_codes if code not in BUNDESLAENDER]
+    if invalid:
+        raise ValueError(f"Ungültiges Bundesland: {', '.join(invalid)}")
+    return state_codes
 
 def save_holidays(holidays):
     """Speichere Feiertage in lokaler Datei"""
@@ -174,12 +234,15 @@ def load_holidays():
         return {}
 
 def list_holidays(year=None):
-    """Liste alle Feiertage auf"""
-    holidays = load_holidays()
+    """Liste alle Feiertage auf (Jahre ohne gespeicherte Feiertage werden berechnet)"""
+    from calendar_index import CalendarIndex
+    
     config = load_state_config()
     
     if year:
-        holidays = {k: v for k, v in holidays.items() if k.startswith(str(year))}
+        holidays = CalendarIndex(vacations=[]).holidays_in_year(year)
+    else:
+        holidays = load_holidays()
     
     if not holidays:
         print("Keine Feiertage gefunden. Führe --update-holidays aus.")
@@ -214,7 +277,7 @@ def list_holidays(year=None):
             }.get(weekday, weekday)
             
             # Markiere regionale Feiertage
-            regional_marker = " 🏛️" if any(x in name for x in ["Heilige Drei Könige", "Fronleichnam", "Mariä Himmelfahrt", "Reformationstag", "Allerheiligen", "Buß- und Bettag", "Frauentag", "regional"]) else ""
+            regional_marker = " 🏛️" if is_regional_holiday(name) else ""
             
             print(f"{date_obj.strftime('%d.%m.%Y')} ({weekday_de}): {name}{regional_marker}")
     
@@ -249,30 +312,28 @@ def set_state(state_code):
 
 def check_today():
     """Prüfe ob heute ein Feiertag ist"""
+    from calendar_index import CalendarIndex
+    
     today = date.today()
-    holidays = load_holidays()
+    index = CalendarIndex(vacations=[])
     config = load_state_config()
     
-    date_str = today.strftime('%Y-%m-%d')
-    holiday_name = holidays.get(date_str)
+    holiday_name = index.is_holiday(today)
     
     if holiday_name:
         regional_info = ""
-        if config and any(x in holiday_name for x in ["Heilige Drei Könige", "Fronleichnam", "Mariä Himmelfahrt", "Reformationstag", "Allerheiligen", "Buß- und Bettag", "Frauentag", "regional"]):
+        if config and is_regional_holiday(holiday_name):
             regional_info = f" (🏛️ {config['state_name']})"
         
         print(f"🎉 Heute ({today.strftime('%d.%m.%Y')}) ist {holiday_name}{regional_info}!")
     else:
         print(f"📅 Heute ({today.strftime('%d.%m.%Y')}) ist kein Feiertag.")
         
-        # Zeige nächsten Feiertag
-        future_holidays = {k: v for k, v in holidays.items() 
-                         if datetime.strptime(k, '%Y-%m-%d').date() > today}
+        # Zeige nächsten Feiertag (bisect über sortierte Feiertagsdaten)
+        next_entry = index.next_holiday(today)
         
-        if future_holidays:
-            next_date = min(future_holidays.keys())
-            next_holiday = future_holidays[next_date]
-            next_date_obj = datetime.strptime(next_date, '%Y-%m-%d').date()
+        if next_entry:
+            next_date_obj, next_holiday = next_entry
             days_until = (next_date_obj - today).days
             
             print(f"🗓️  Nächster Feiertag: {next_holiday} am {next_date_obj.strftime('%d.%m.%Y')} (in {days_until} Tagen)")
@@ -284,14 +345,46 @@ def check_today():
         print(f"\n⚠️  Kein Bundesland konfiguriert! Verwende:")
         print(f"   timew-holidays --set-state [BUNDESLAND]")
 
+def show_upcoming(count):
+    """Zeige die nächsten besonderen Tage (Feiertage und Urlaube) in einer Liste"""
+    from calendar_index import CalendarIndex
+    
+    today = date.today()
+    upcoming = CalendarIndex().upcoming(today, count)
+    
+    print(f"\n{'='*70}")
+    print(f"NÄCHSTE BESONDERE TAGE (ab {today.strftime('%d.%m.%Y')})")
+    print(f"{'='*70}")
+    
+    if not upcoming:
+        print("Keine besonderen Tage gefunden.")
+    
+    weekdays_de = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+    for day, kind, value in upcoming:
+        days_until = (day - today).days
+        prefix = f"{day.strftime('%d.%m.%Y')} ({weekdays_de[day.weekday()]})"
+        
+        if kind == 'holiday':
+            print(f"{prefix}: 🎉 {value} (in {days_until} Tagen)")
+        else:
+            end_date = datetime.strptime(value['end'], '%Y-%m-%d').date()
+            print(f"{prefix}: 🏖️ {value['type']}: {value['name']} bis {end_date.strftime('%d.%m.%Y')} (in {days_until} Tagen)")
+    
+    print(f"{'='*70}\n")
+
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description='Timewarrior Regional Holiday Manager')
-    parser.add_argument('--update-holidays', type=int, metavar='YEAR', 
-                       help='Aktualisiere Feiertage für Jahr (mit regionalem Bundesland)')
+    parser.add_argument('--update-holidays', metavar='YEAR[-YEAR]', 
+                       help='Aktualisiere Feiertage für Jahr oder Jahresbereich (mit regionalem Bundesland)')
+    parser.add_argument('--states', metavar='STATES',
+                       help='Mit --update-holidays: kompakte Tabelle für Bundesländer (z.B. BY,BW oder ALL)')
     parser.add_argument('--list', type=int, nargs='?', const=0, metavar='YEAR',
                        help='Liste Feiertage auf (optional: nur bestimmtes Jahr)')
     parser.add_argument('--check-today', action='store_true',
                        help='Prüfe ob heute ein Feiertag ist')
+    parser.add_argument('--upcoming', type=int, metavar='N',
+                       help='Zeige die nächsten N Feiertage und Urlaube')
     parser.add_argument('--set-state', metavar='STATE',
                        help='Setze Bundesland (BW, BY, BE, BB, HB, HH, HE, MV, NI, NW, RP, SL, SN, ST, SH, TH)')
     parser.add_argument('--show-states', action='store_true',
@@ -312,11 +405,28 @@ def main():
         print(f"Verwendung: timew-holidays --set-state {list(BUNDESLAENDER.keys())[0]}")
         
     elif args.update_holidays:
-        year = args.update_holidays
+        try:
+            years = parse_year_range(args.update_holidays)
+            state_codes = parse_states(args.states) if args.states else None
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        year_label = str(years[0]) if len(years) == 1 else f"{years[0]}-{years[-1]}"
+        
+        if state_codes:
+            # Bulk-Modus: kompakte Tabelle für mehrere Bundesländer
+            print(f"🔄 Berechne Feiertage für {year_label} ({len(state_codes)} Bundesländer)...")
+            table = compute_holiday_table(years, state_codes)
+            table_file = save_holiday_table(table, years)
+            total = sum(len(holidays) for holidays in table.values())
+            print(f"✅ {total} Feiertage gespeichert: {table_file}")
+            return
+        
         config = load_state_config()
         state_code = config['state'] if config else None
         
-        print(f"🔄 Aktualisiere Feiertage für {year}...")
+        print(f"🔄 Aktualisiere Feiertage für {year_label}...")
         if state_code:
             print(f"   Bundesland: {config['state_name']} ({state_code})")
         else:
@@ -326,15 +436,15 @@ def main():
         existing_holidays = load_holidays()
         
         # Füge neue Feiertage hinzu
-        new_holidays = get_german_holidays(year, state_code)
+        new_holidays = compute_holiday_table(years, [state_code])[state_code]
         existing_holidays.update(new_holidays)
         
         # Speichere aktualisierte Liste
         save_holidays(existing_holidays)
         
-        regional_count = len([h for h in new_holidays.values() if any(x in h for x in ["Heilige Drei Könige", "Fronleichnam", "Mariä Himmelfahrt", "Reformationstag", "Allerheiligen", "Buß- und Bettag", "Frauentag", "regional"])])
+        regional_count = len([h for h in new_holidays.values() if is_regional_holiday(h)])
         
-        print(f"✅ {len(new_holidays)} Feiertage für {year} hinzugefügt!")
+        print(f"✅ {len(new_holidays)} Feiertage für {year_label} hinzugefügt!")
         print(f"   davon {regional_count} regionale Feiertage")
         
     elif args.list is not None:
@@ -344,6 +454,9 @@ def main():
     elif args.check_today:
         check_today()
         
+    elif args.upcoming:
+        show_upcoming(args.upcoming)
+        
     else:
         # Standard: Zeige heutigen Status und verfügbare Befehle
         check_today()
@@ -351,8 +464,10 @@ def main():
         print("timew-holidays --set-state BY                 # Bundesland Bayern setzen")
         print("timew-holidays --show-states                  # Alle Bundesländer anzeigen")
         print("timew-holidays --update-holidays 2024         # Feiertage für 2024 (mit Bundesland)")
+        print("timew-holidays --update-holidays 2000-2060 --states ALL  # Tabelle für alle Bundesländer")
         print("timew-holidays --list                         # Alle Feiertage")
         print("timew-holidays --check-today                  # Heutigen Status prüfen")
+        print("timew-holidays --upcoming 10                  # Nächste 10 Feiertage/Urlaube")
 
 if __name__ == '__main__':
     main()
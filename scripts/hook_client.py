@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Hook Client
+Leitet Hook-Eingaben an den laufenden Hook-Daemon weiter (siehe hook_daemon.py)
+
+Protokoll über den Unix-Socket:
+  Anfrage:  {"hook": NAME}\\n gefolgt von der unveränderten Hook-Eingabe (stdin)
+  Antwort:  "ok\\n" bzw. "error\\n" gefolgt von der Ausgabe des Hooks (stdout)
+
+Ist die Anfrage einmal angenommen, wartet der Client bis REPLY_TIMEOUT auf die
+Antwort: die Socket-Frist des Daemons (DAEMON_TIMEOUT) plus Reserve für
+Anfragen, die vor ihr in der Warteschlange stehen. Bei "error", abgebrochener
+Verbindung oder abgelaufener Frist führt der Client den Hook selbst aus, damit
+timew nie hängen bleibt. Nur im letzten Fall kann process() in Daemon und
+Client gleichzeitig laufen; ein Schreibzugriff auf daily_rollup.json bzw.
+notifications.json kann dann verloren gehen.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_FILE = os.path.expanduser('~/.timewarrior/data/cache/hookd.sock')
+
+# Wartezeit auf Verbindung und Annahme der Anfrage; danach führt der Hook sich selbst aus
+CONNECT_TIMEOUT = 0.5
+
+# Socket-Frist des Daemons pro Verbindung
+DAEMON_TIMEOUT = 5.0
+
+# Wartezeit auf die Antwort; danach führt der Hook sich selbst aus
+REPLY_TIMEOUT = DAEMON_TIMEOUT + 5.0
+
+def _receive_all(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+def request(hook_name, input_data, socket_file=SOCKET_FILE, timeout=CONNECT_TIMEOUT,
+            reply_timeout=REPLY_TIMEOUT):
+    """Ausgabe des Hooks vom Daemon oder None (Daemon läuft nicht / Fehler / Frist abgelaufen)
+
+    timeout begrenzt Verbindung und Senden, reply_timeout das Warten auf die
+    Antwort, auch wenn der Daemon gerade andere Anfragen bearbeitet.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_file)
+            header = json.dumps({'hook': hook_name}) + '\n'
+            sock.sendall(header.encode('utf-8') + input_data.encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+            sock.settimeout(reply_timeout)
+            response = _receive_all(sock)
+    except OSError:
+        return None
+
+    status, _, output = response.partition(b'\n')
+    if status != b'ok':
+        return None
+    return output.decode('utf-8')
+
+def forward(hook_name, input_data):
+    """Schreibe Antwort des Daemons nach stdout; False, wenn der Hook selbst laufen muss"""
+    output = request(hook_name, input_data)
+    if output is None:
+        return False
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    return True
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Hook Daemon
+Hält Python, Hook-Module und Kalenderdaten zwischen timew-Aufrufen geladen
+
+Die Hooks in ~/.timewarrior/hooks werden einmal geladen (bei Änderung neu) und
+ihre process()-Funktion pro Anfrage aufgerufen. Läuft der Daemon nicht, führen
+die Hooks dieselbe Funktion selbst aus.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+HOOKS_DIR = os.path.expanduser('~/.timewarrior/hooks')
+LIB_DIR = os.path.expanduser('~/.timewarrior/lib')
+
+sys.path.insert(0, LIB_DIR)
+from hook_client import DAEMON_TIMEOUT, SOCKET_FILE, request
+from hook_pipeline import load_source
+
+# Maximale Größe einer Anfrage (Hook-Eingabe ist ein einzelnes Intervall-JSON)
+MAX_REQUEST = 16 * 1024 * 1024
+
+class HookRegistry:
+    """Geladene Hook-Module, neu geladen wenn sich die Datei ändert"""
+
+    def __init__(self, hooks_dir=HOOKS_DIR):
+        self.hooks_dir = hooks_dir
+        self.modules = {}
+
+    def get(self, hook_name):
+        """Modul mit process(input_data) für einen Hook-Namen"""
+        if os.path.basename(hook_name) != hook_name or not hook_name.startswith('on-'):
+            raise ValueError(f"Ungültiger Hook: {hook_name}")
+
+        path = os.path.join(self.hooks_dir, hook_name)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.modules.get(hook_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        module = load_source(path, 'timew_hook_' + hook_name.replace('-', '_'))
+        if not hasattr(module, 'process'):
+            raise ValueError(f"{hook_name} hat keine process()-Funktion")
+
+        self.modules[hook_name] = (mtime, module)
+        return module
+
+def _read_request(conn):
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_REQUEST:
+            raise ValueError("Anfrage zu groß")
+        chunks.append(chunk)
+
+    header, _, body = b''.join(chunks).partition(b'\n')
+    return json.loads(header)['hook'], body.decode('utf-8')
+
+def handle(conn, registry):
+    """Eine Anfrage: Hook ausführen, stdout des Hooks zurückschicken"""
+    try:
+        hook_name, input_data = _read_request(conn)
+        if hook_name == 'status':
+            response = b'ok\n'
+        else:
+            module = registry.get(hook_name)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                module.process(input_data)
+            response = b'ok\n' + output.getvalue().encode('utf-8')
+    except Exception:
+        # Client führt den Hook dann selbst aus
+        traceback.print_exc()
+        response = b'error\n'
+
+    try:
+        conn.sendall(response)
+    except OSError:
+        pass
+
+def serve(socket_file=SOCKET_FILE, hooks_dir=HOOKS_DIR):
+    """Bearbeite Anfragen nacheinander, bis SIGTERM/SIGINT kommt"""
+    if request('status', '', socket_file, reply_timeout=1.0) is not None:
+        print(f"❌ Hook-Daemon läuft bereits ({socket_file})")
+        return 1
+
+    # Verwaister Socket eines abgestürzten Daemons
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(socket_file)
+
+    os.makedirs(os.path.dirname(socket_file), exist_ok=True)
+    registry = HookRegistry(hooks_dir)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(socket_file)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"🚀 Hook-Daemon gestartet: {socket_file}")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                conn.settimeout(DAEMON_TIMEOUT)
+                handle(conn, registry)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_file)
+        print("🛑 Hook-Daemon beendet")
+    return 0
+
+def status(socket_file=SOCKET_FILE):
+    """Prüfe, ob der Daemon antwortet"""
+    started = time.perf_counter()
+    reachable = request('status', '', socket_file, reply_timeout=1.0) is not None
+    if reachable:
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✅ Hook-Daemon läuft ({socket_file}, Antwort in {elapsed:.1f}ms)")
+    else:
+        print("💤 Hook-Daemon läuft nicht - Hooks werden direkt ausgeführt")
+    return 0 if reachable else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Timewarrior Hook Daemon')
+    parser.add_argument('--status', action='store_true', help='Prüfe, ob der Daemon läuft')
+    parser.add_argument('--socket', default=SOCKET_FILE, help='Pfad des Unix-Sockets')
+    args = parser.parse_args()
+
+    if args.status:
+        return status(args.socket)
+    return serve(args.socket)
+
+if __name__ == '__main__':
+    sys.exit(main())
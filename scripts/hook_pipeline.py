@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Hook Pipeline
+Führt die on-modify-Prüfungen als Stufen über einmal geparste Hook-Daten aus
+
+Jede Stufe ist eine Hook-Datei in ~/.timewarrior/hooks/stages mit einer
+Funktion stage(data) -> data. Ob eine Stufe läuft, steht in timewarrior.cfg
+(define.<name>.enabled; die Feiertagsstufe läuft, solange Feiertage oder Urlaub
+aktiviert sind); define.hooks.debug = yes gibt die Laufzeiten auf stderr aus.
+"""
+
+import os
+import sys
+import time
+
+from timew_config import read_config
+
+STAGES_DIR = os.path.expanduser('~/.timewarrior/hooks/stages')
+
+# (Name, Hook-Datei, Konfigurationsschlüssel) in Ausführungsreihenfolge;
+# eine Stufe läuft, wenn einer ihrer Schlüssel aktiviert ist
+STAGES = [
+    ('autopause', 'on-modify-autopause', ('define.autopause.enabled',)),
+    ('warnings', 'on-modify-warnings', ('define.warnings.enabled',)),
+    ('holidays', 'on-modify-holidays', ('define.holidays.enabled', 'define.vacation.enabled')),
+]
+
+TRUE_VALUES = ('yes', 'on', 'true', 'y', '1')
+
+_modules = {}
+
+def load_source(path, module_name):
+    """Lade eine Python-Datei ohne .py-Endung als Modul"""
+    from importlib.machinery import SourceFileLoader
+    from importlib.util import module_from_spec, spec_from_loader
+
+    loader = SourceFileLoader(module_name, path)
+    module = module_from_spec(spec_from_loader(module_name, loader))
+    loader.exec_module(module)
+    return module
+
+def is_enabled(config, key, default=True):
+    """Wahrheitswert aus der Konfiguration"""
+    if key not in config:
+        return default
+    return config[key].lower() in TRUE_VALUES
+
+def load_stage(hook_name, stages_dir=STAGES_DIR):
+    """Stufenmodul (einmal pro Prozess geladen, bei Änderung neu)"""
+    path = os.path.join(stages_dir, hook_name)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _modules.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    module = load_source(path, 'timew_stage_' + hook_name.replace('-', '_'))
+    _modules[path] = (mtime, module)
+    return module
+
+def run_pipeline(data, config=None, stages_dir=STAGES_DIR):
+    """Alle aktivierten Stufen nacheinander; eine fehlerhafte Stufe wird übersprungen"""
+    if config is None:
+        config = read_config()
+    debug = is_enabled(config, 'define.hooks.debug', default=False)
+    total = time.perf_counter()
+
+    for name, hook_name, keys in STAGES:
+        if not any(is_enabled(config, key) for key in keys):
+            if debug:
+                print(f"[hooks] {name}: deaktiviert", file=sys.stderr)
+            continue
+
+        started = time.perf_counter()
+        try:
+            data = load_stage(hook_name, stages_dir).stage(data)
+        except Exception as e:
+            if debug:
+                print(f"[hooks] {name}: Fehler {e!r}", file=sys.stderr)
+            continue
+        if debug:
+            print(f"[hooks] {name}: {(time.perf_counter() - started) * 1000:.1f}ms", file=sys.stderr)
+
+    if debug:
+        print(f"[hooks] gesamt: {(time.perf_counter() - total) * 1000:.1f}ms", file=sys.stderr)
+    return data
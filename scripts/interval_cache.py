@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Interval Cache
+Persistenter SQLite-Cache der geparsten Intervalle, aktualisiert pro Monatsdatei (mtime/Größe)
+"""
+
+import json
+import os
+import sqlite3
+
+from timew_data import DATA_DIR, list_data_files, parse_data_file, get_range_bounds
+
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+CACHE_FILE = os.path.join(CACHE_DIR, 'intervals.sqlite')
+
+SCHEMA_VERSION = 1
+
+# Fehler, bei denen auf das direkte Lesen der Datendateien ausgewichen wird
+CACHE_ERRORS = (sqlite3.Error, ValueError, OSError)
+
+# Wie oft eine Datei neu gelesen wird, wenn timew währenddessen schreibt
+READ_RETRIES = 3
+
+# Zeilen pro Block bei query_table (begrenzt den Zwischenspeicher)
+FETCH_ROWS = 10000
+
+RANGE_QUERY = ('SELECT start, end, tags, annotation FROM intervals '
+               'WHERE start >= ? AND start < ? AND (end IS NULL OR end > ?) '
+               'ORDER BY start, rowid')
+
+def _range_parameters(start_date, end_date):
+    """Parameter für RANGE_QUERY zu [start_date, end_date] (inklusive)"""
+    range_start, range_end, first_month, _ = get_range_bounds(start_date, end_date)
+    earliest = f"{first_month[0]:04d}{first_month[1]:02d}01T000000Z"
+    return earliest, range_end, range_start
+
+def connect(cache_file=CACHE_FILE):
+    """Öffne Cache-Datenbank und lege Schema an"""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    conn = sqlite3.connect(cache_file, timeout=10, isolation_level=None)
+
+    if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript(f'''
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS intervals;
+            CREATE TABLE files (name TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL);
+            CREATE TABLE intervals (file TEXT NOT NULL, start TEXT NOT NULL, end TEXT,
+                                    tags TEXT, annotation TEXT);
+            CREATE INDEX intervals_start ON intervals (start);
+            CREATE INDEX intervals_file ON intervals (file);
+            PRAGMA user_version = {SCHEMA_VERSION};
+        ''')
+
+    return conn
+
+def _read_stable(path, stat):
+    """Parse Datei; lese neu, falls timew während des Lesens geschrieben hat"""
+    for _ in range(READ_RETRIES):
+        entries = parse_data_file(path)
+        after = os.stat(path)
+        if (after.st_mtime_ns, after.st_size) == (stat.st_mtime_ns, stat.st_size):
+            return entries, stat
+        stat = after
+    raise OSError(f"{path} wird gerade geschrieben")
+
+def refresh(conn, data_dir=DATA_DIR):
+    """Aktualisiere nur Monatsdateien, deren mtime oder Größe sich geändert hat"""
+    files = list_data_files(data_dir)
+    if not files:
+        raise ValueError(f"Keine Timewarrior-Daten in {data_dir}")
+
+    # BEGIN IMMEDIATE serialisiert parallele Reports beim Aktualisieren
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        known = {name: (mtime_ns, size)
+                 for name, mtime_ns, size in conn.execute('SELECT name, mtime_ns, size FROM files')}
+
+        for _, path in files:
+            name = os.path.basename(path)
+            stat = os.stat(path)
+            if known.pop(name, None) == (stat.st_mtime_ns, stat.st_size):
+                continue
+
+            entries, stat = _read_stable(path, stat)
+            conn.execute('DELETE FROM intervals WHERE file = ?', (name,))
+            conn.executemany(
+                'INSERT INTO intervals (file, start, end, tags, annotation) VALUES (?, ?, ?, ?, ?)',
+                [(name, entry['start'], entry.get('end'),
+                  json.dumps(entry['tags'], ensure_ascii=False) if 'tags' in entry else None,
+                  entry.get('annotation'))
+                 for entry in entries])
+            conn.execute('INSERT OR REPLACE INTO files (name, mtime_ns, size) VALUES (?, ?, ?)',
+                         (name, stat.st_mtime_ns, stat.st_size))
+
+        # Gelöschte Monatsdateien entfernen
+        for name in known:
+            conn.execute('DELETE FROM intervals WHERE file = ?', (name,))
+            conn.execute('DELETE FROM files WHERE name = ?', (name,))
+
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+def query_intervals(start_date, end_date, data_dir=DATA_DIR, cache_file=CACHE_FILE):
+    """Hole Intervalle für [start_date, end_date] (inklusive) aus dem Cache
+
+    Liefert dieselben Einträge wie timew_data.read_intervals.
+    """
+    conn = connect(cache_file)
+    try:
+        refresh(conn, data_dir)
+
+        rows = conn.execute(RANGE_QUERY, _range_parameters(start_date, end_date)).fetchall()
+
+        if not rows:
+            return []
+
+        # IDs wie bei `timew export`: @1 ist das jüngste Intervall der gesamten Datenbank
+        next_id = conn.execute('SELECT COUNT(*) FROM intervals WHERE start >= ?',
+                               (rows[0][0],)).fetchone()[0]
+    finally:
+        conn.close()
+
+    result = []
+    for start, end, tags, annotation in rows:
+        entry = {'id': next_id, 'start': start}
+        next_id -= 1
+        if end is not None:
+            entry['end'] = end
+        if tags is not None:
+            entry['tags'] = json.loads(tags)
+        if annotation:
+            entry['annotation'] = annotation
+        result.append(entry)
+
+    return result
+
+def query_table(start_date, end_date, data_dir=DATA_DIR, cache_file=CACHE_FILE):
+    """Wie query_intervals, aber als IntervalTable (ohne IDs und Annotationen)
+
+    Die Zeilen werden blockweise direkt in die Tabelle übernommen; Export-Dicts
+    entstehen nicht, jede Tag-Spalte wird nur einmal pro Wert als JSON gelesen.
+    """
+    from interval_table import IntervalTable
+
+    table = IntervalTable()
+    tag_ids = {}
+
+    def tag_id(text):
+        known = tag_ids.get(text)
+        if known is None:
+            known = tag_ids[text] = table.intern(json.loads(text) if text is not None else ())
+        return known
+
+    conn = connect(cache_file)
+    try:
+        refresh(conn, data_dir)
+
+        cursor = conn.execute(RANGE_QUERY, _range_parameters(start_date, end_date))
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            table.extend_stamps([row[0] for row in rows], [row[1] for row in rows],
+                                [tag_id(row[2]) for row in rows])
+    finally:
+        conn.close()
+
+    return table
+
+def rebuild_cache(data_dir=DATA_DIR, cache_file=CACHE_FILE):
+    """Verwerfe den Cache und baue ihn komplett neu auf"""
+    for suffix in ('', '-journal', '-wal', '-shm'):
+        try:
+            os.remove(cache_file + suffix)
+        except FileNotFoundError:
+            pass
+
+    conn = connect(cache_file)
+    try:
+        refresh(conn, data_dir)
+        return conn.execute('SELECT COUNT(*) FROM intervals').fetchone()[0]
+    finally:
+        conn.close()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Interval Table
+Kompakte, spaltenweise Ablage von Intervallen für Auswertungen über lange Zeiträume
+
+Start und Ende liegen als Epoch-Sekunden in array('q')-Spalten, Tags als ID
+einer internierten Tag-Menge. Eine Zeile kostet so rund 20 Bytes statt eines
+Export-Dicts mit eigenen Strings und Listen; mehrere Jahre passen in wenige MB.
+Zeilen werden über IntervalRow-Ansichten gelesen, ohne Daten zu kopieren.
+"""
+
+from array import array
+
+from timestamps import parse_bounds, parse_many
+
+UNTAGGED = 'Ohne Projekt'
+
+# Ende aktiver Intervalle (array('q') kennt kein None); hält die Endspalte sortiert
+OPEN_END = 2 ** 63 - 1
+
+def project_of(tags):
+    """Projektname aus Tags (erster Tag)"""
+    return tags[0] if tags else UNTAGGED
+
+class IntervalRow:
+    """Ansicht auf eine Zeile einer IntervalTable"""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def start(self):
+        """Beginn in Epoch-Sekunden"""
+        return self.table.starts[self.index]
+
+    @property
+    def end(self):
+        """Ende in Epoch-Sekunden, None bei aktivem Intervall"""
+        end = self.table.ends[self.index]
+        return None if end == OPEN_END else end
+
+    @property
+    def active(self):
+        """Läuft das Intervall noch?"""
+        return self.table.ends[self.index] == OPEN_END
+
+    @property
+    def tags(self):
+        """Tags als Tupel"""
+        return self.table.tag_sets[self.table.tag_ids[self.index]]
+
+    @property
+    def project(self):
+        """Projektname (erster Tag)"""
+        return self.table.projects[self.table.tag_ids[self.index]]
+
+    @property
+    def duration(self):
+        """Dauer in Sekunden; aktive Intervalle zählen bis table.now"""
+        end = self.table.ends[self.index]
+        if end == OPEN_END:
+            end = self.table.now
+        return end - self.table.starts[self.index]
+
+class IntervalTable:
+    """Intervalle als parallele Spalten mit internierten Tag-Mengen
+
+    starts/ends: array('q') in Epoch-Sekunden (ends = OPEN_END bei aktiven Intervallen)
+    tag_ids:     array('i') mit Index in tag_sets/projects
+    now:         Bezugszeitpunkt für die Dauer aktiver Intervalle
+    """
+
+    __slots__ = ('starts', 'ends', 'tag_ids', 'tag_sets', 'projects', 'now', '_tag_index')
+
+    def __init__(self, now=None):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.tag_ids = array('i')
+        self.tag_sets = []
+        self.projects = []
+        self.now = now
+        self._tag_index = {}
+
+    @classmethod
+    def from_export(cls, intervals, now=None):
+        """Tabelle aus Export-Einträgen (Zeitstempel im Batch geparst)"""
+        table = cls(now)
+        if not isinstance(intervals, list):
+            intervals = list(intervals)
+        bounds = parse_bounds(intervals, OPEN_END)
+        table.starts.extend([start for start, _ in bounds])
+        table.ends.extend([end for _, end in bounds])
+        table.tag_ids.extend([table.intern(entry.get('tags', ())) for entry in intervals])
+        return table
+
+    def extend_stamps(self, starts, ends, tag_ids):
+        """Zeilen aus Zeitstempel-Spalten anhängen (Batch)
+
+        starts/ends: Listen von Timewarrior-Zeitstempeln (end None bei aktiven
+        Intervallen), tag_ids: bereits internierte Tag-Mengen. Für Quellen, die
+        Zeilen blockweise liefern, ohne vorher Export-Dicts zu bauen.
+        """
+        self.starts.extend(parse_many(starts))
+        closed = [end for end in ends if end is not None]
+        if len(closed) == len(ends):
+            self.ends.extend(parse_many(closed))
+        else:
+            parsed = iter(parse_many(closed))
+            self.ends.extend([OPEN_END if end is None else next(parsed) for end in ends])
+        self.tag_ids.extend(tag_ids)
+
+    def take(self, indices):
+        """Neue Tabelle mit den Zeilen indices (Tag-Mengen werden übernommen)"""
+        table = IntervalTable(self.now)
+        table.starts.extend([self.starts[index] for index in indices])
+        table.ends.extend([self.ends[index] for index in indices])
+        table.tag_ids.extend([self.tag_ids[index] for index in indices])
+        table.tag_sets = list(self.tag_sets)
+        table.projects = list(self.projects)
+        table._tag_index = dict(self._tag_index)
+        return table
+
+    def intern(self, tags):
+        """ID einer Tag-Menge (gleiche Tags teilen sich einen Eintrag)"""
+        tags = tuple(tags)
+        tag_id = self._tag_index.get(tags)
+        if tag_id is None:
+            tag_id = self._tag_index[tags] = len(self.tag_sets)
+            self.tag_sets.append(tags)
+            self.projects.append(project_of(tags))
+        return tag_id
+
+    def append(self, start, end, tags):
+        """Zeile anhängen (end=None für aktive Intervalle)"""
+        self.starts.append(start)
+        self.ends.append(OPEN_END if end is None else end)
+        self.tag_ids.append(self.intern(tags))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.starts)
+        if not 0 <= index < len(self.starts):
+            raise IndexError(index)
+        return IntervalRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.starts)):
+            yield IntervalRow(self, index)
+
+    def nbytes(self):
+        """Speicher der Spalten in Bytes (ohne die internierten Tag-Mengen)"""
+        return sum(column.itemsize * len(column) for column in (self.starts, self.ends, self.tag_ids))
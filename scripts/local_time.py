@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Local Time
+Zuordnung von Intervallen zu lokalen Kalendertagen
+
+Timewarrior speichert UTC. Für Tagessummen zählt aber der lokale Tag:
+Intervalle werden an lokaler Mitternacht geteilt. Die Zeitzone kommt aus
+timewarrior.cfg (define.reports.timezone = Europe/Berlin), sonst gilt die
+Systemzeitzone. Mitternachten werden pro Tag einmal berechnet und gecacht,
+damit auch mehrjährige Zeiträume linear bleiben.
+"""
+
+from datetime import datetime, time, timedelta
+
+from timew_config import read_config
+
+TIMEZONE_KEY = 'define.reports.timezone'
+
+ONE_DAY = timedelta(days=1)
+
+_timezone = None
+
+def get_timezone():
+    """Konfigurierte Zeitzone (None = Systemzeitzone), einmal pro Prozess gelesen"""
+    global _timezone
+    if _timezone is None:
+        name = read_config().get(TIMEZONE_KEY, '')
+        _timezone = (load_timezone(name),)
+    return _timezone[0]
+
+def load_timezone(name):
+    """tzinfo zu einem IANA-Namen; None bei leerem oder unbekanntem Namen"""
+    if not name:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except (ImportError, ValueError, LookupError, OSError):
+        return None
+
+class LocalDays:
+    """Lokale Tage einer Zeitzone mit gecachten Mitternachten (Epoch-Sekunden)"""
+
+    def __init__(self, tz=None):
+        self.tz = tz
+        self._midnights = {}
+        self._last_day = None
+
+    def midnight(self, day):
+        """Lokale Mitternacht eines Tages als Epoch-Sekunden"""
+        value = self._midnights.get(day)
+        if value is None:
+            # Ohne tzinfo interpretiert timestamp() naive Zeiten als Systemzeit
+            value = int(datetime.combine(day, time.min, tzinfo=self.tz).timestamp())
+            self._midnights[day] = value
+        return value
+
+    def day_of(self, ts):
+        """Lokaler Tag eines Zeitpunkts (Epoch-Sekunden)"""
+        day = self._last_day
+        if day is None or not self.midnight(day) <= ts < self.midnight(day + ONE_DAY):
+            day = datetime.fromtimestamp(ts, self.tz).date()
+            self._last_day = day
+        return day
+
+    def split(self, start, end):
+        """Teile [start, end) an lokaler Mitternacht als [(tag, start, end), ...]"""
+        day = self.day_of(start)
+        parts = []
+        while True:
+            next_day = day + ONE_DAY
+            boundary = self.midnight(next_day)
+            if end <= boundary:
+                parts.append((day, start, end))
+                return parts
+            parts.append((day, start, boundary))
+            start = boundary
+            day = next_day
+
+    def to_datetime(self, ts):
+        """Epoch-Sekunden als lokale datetime"""
+        return datetime.fromtimestamp(ts, self.tz)
+
+_default = None
+
+def local_days():
+    """LocalDays der konfigurierten Zeitzone (pro Prozess geteilt)"""
+    global _default
+    if _default is None:
+        _default = LocalDays(get_timezone())
+    return _default
+
+def local_midnight(day):
+    """Lokale Mitternacht eines Datums als Epoch-Sekunden"""
+    return local_days().midnight(day)
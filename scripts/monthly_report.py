@@ -4,58 +4,19 @@ Timewarrior Monthly Report
 Monatlicher Bericht mit Feiertags-, Urlaubs- und Projektanalyse
 """
 
-import subprocess
-import json
-import os
-from datetime import datetime, date, timedelta
-import calendar
-import argparse
+from datetime import date, timedelta
 
-def load_holidays():
-    """Lade Feiertage aus lokaler Datei"""
-    holidays_file = os.path.expanduser('~/.timewarrior/data/holidays/holidays.json')
-    try:
-        with open(holidays_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return {}
-
-def load_vacations():
-    """Lade Urlaubsdaten aus lokaler Datei"""
-    vacation_file = os.path.expanduser('~/.timewarrior/data/vacation/vacation.json')
-    try:
-        with open(vacation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
-
-def is_holiday(check_date):
-    """Prüfe ob gegebenes Datum ein Feiertag ist"""
-    holidays = load_holidays()
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    return holidays.get(date_str, None)
-
-def is_vacation(check_date):
-    """Prüfe ob gegebenes Datum ein Urlaubstag ist"""
-    vacations = load_vacations()
-    
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    
-    for vacation in vacations:
-        if vacation['start'] <= date_str <= vacation['end']:
-            return vacation
-    return None
+from aggregation import aggregate
+from calendar_index import is_holiday, is_vacation
+from workdays import working_days as count_working_days
+from timew_data import get_interval_table, partition_table, rebuild_interval_cache
 
 def get_month_dates(year, month):
     """Hole alle Daten des Monats"""
     first_day = date(year, month, 1)
-    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    # Letzter Tag ohne das calendar-Modul (lädt locale beim Import)
+    next_year, next_month = divmod(year * 12 + month, 12)
+    last_day = date(next_year, next_month + 1, 1) - timedelta(days=1)
     
     month_dates = []
     current_date = first_day
@@ -66,31 +27,8 @@ def get_month_dates(year, month):
     return month_dates
 
 def get_timewarrior_data_for_period(start_date, end_date):
-    """Hole Timewarrior-Daten für Zeitraum"""
-    try:
-        start_str = start_date.strftime('%Y-%m-%d')
-        end_str = end_date.strftime('%Y-%m-%d')
-        
-        # Hole export für detaillierte Daten
-        if start_str == end_str:
-            export_result = subprocess.run(['timew', 'export', start_str], 
-                                         capture_output=True, text=True, check=True)
-        else:
-            export_result = subprocess.run(['timew', 'export', f'{start_str}', f'to', f'{end_str}'], 
-                                         capture_output=True, text=True, check=True)
-        
-        # Parse Export JSON
-        export_data = []
-        if export_result.stdout.strip():
-            try:
-                export_data = json.loads(export_result.stdout)
-            except:
-                export_data = []
-        
-        return export_data
-        
-    except subprocess.CalledProcessError:
-        return []
+    """Hole Timewarrior-Daten für Zeitraum (inklusive end_date)"""
+    return get_interval_table(start_date, end_date)
 
 def format_duration(seconds):
     """Formatiere Sekunden zu HH:MM"""
@@ -101,14 +39,13 @@ def format_duration(seconds):
     minutes = int((seconds % 3600) // 60)
     return f"{hours}:{minutes:02d}"
 
-def generate_monthly_report(year, month):
-    """Generiere monatlichen Bericht"""
+def generate_monthly_report(year, month, export_data=None):
+    """Generiere monatlichen Bericht (export_data: bereits geladene Intervalle des Monats)"""
     
     month_dates = get_month_dates(year, month)
     first_day = month_dates[0]
     last_day = month_dates[-1]
     
-    month_name = calendar.month_name[month]
     months_de = ['', 'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
                  'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember']
     month_name_de = months_de[month]
@@ -118,21 +55,17 @@ def generate_monthly_report(year, month):
     print(f"{'='*100}")
     
     # Hole alle Daten für den Monat
-    export_data = get_timewarrior_data_for_period(first_day, last_day)
+    if export_data is None:
+        export_data = get_timewarrior_data_for_period(first_day, last_day)
     
-    # Organisiere Daten nach Tagen und Wochen
+    # Kalenderstatus der Tage
     daily_data = {}
-    weekly_data = {}
-    total_month_seconds = 0
-    working_days = 0
+    working_days = count_working_days(first_day, last_day)
     holiday_days = 0
     vacation_days = 0
     
     for day_date in month_dates:
         daily_data[day_date] = {
-            'entries': [],
-            'total_seconds': 0,
-            'projects': {},
             'is_holiday': False,
             'is_vacation': False,
             'is_weekend': day_date.weekday() >= 5
@@ -145,39 +78,10 @@ def generate_monthly_report(year, month):
         elif is_vacation(day_date):
             daily_data[day_date]['is_vacation'] = True
             vacation_days += 1
-        elif not daily_data[day_date]['is_weekend']:
-            working_days += 1
-    
-    # Verarbeite Export-Daten
-    month_projects = {}
-    for entry in export_data:
-        if 'end' not in entry:  # Aktive Einträge überspringen
-            continue
-            
-        start = datetime.fromisoformat(entry['start'].replace('Z', '+00:00'))
-        end = datetime.fromisoformat(entry['end'].replace('Z', '+00:00'))
-        duration = (end - start).total_seconds()
-        
-        # Zuordnung zum Tag (basierend auf Startzeit)
-        entry_date = start.date()
-        
-        if entry_date in daily_data:
-            daily_data[entry_date]['entries'].append(entry)
-            daily_data[entry_date]['total_seconds'] += duration
-            total_month_seconds += duration
-            
-            # Projektname aus Tags
-            tags = entry.get('tags', [])
-            project = tags[0] if tags else 'Ohne Projekt'
-            
-            if project not in daily_data[entry_date]['projects']:
-                daily_data[entry_date]['projects'][project] = 0
-            daily_data[entry_date]['projects'][project] += duration
-            
-            # Monatsprojekte
-            if project not in month_projects:
-                month_projects[project] = 0
-            month_projects[project] += duration
+    
+    # Ein Durchlauf: Tag × Projekt-Matrix mit Wochen- und Projektsummen (aktive Einträge übersprungen)
+    summary = aggregate(export_data, days=month_dates)
+    total_month_seconds = summary.total
     
     # Monatsübersicht
     total_hours = total_month_seconds / 3600
@@ -223,21 +127,18 @@ def generate_monthly_report(year, month):
         if week_key not in weeks:
             weeks[week_key] = {
                 'dates': [],
-                'total_seconds': 0,
+                'total_seconds': summary.week_totals.get((year_week, week_num), 0),
                 'working_days': 0
             }
         
         weeks[week_key]['dates'].append(day_date)
-        weeks[week_key]['total_seconds'] += daily_data[day_date]['total_seconds']
-        
-        if not daily_data[day_date]['is_holiday'] and not daily_data[day_date]['is_vacation'] and not daily_data[day_date]['is_weekend']:
-            weeks[week_key]['working_days'] += 1
     
     for week_key in sorted(weeks.keys()):
         week_data = weeks[week_key]
         week_dates = sorted(week_data['dates'])
         start_date = week_dates[0]
         end_date = week_dates[-1]
+        week_data['working_days'] = count_working_days(start_date, end_date)
         
         week_num = int(week_key.split('-')[1])
         date_range = f"{start_date.strftime('%d.%m.')} - {end_date.strftime('%d.%m.')}"
@@ -267,19 +168,16 @@ def generate_monthly_report(year, month):
     print(f"\n📋 PROJEKT-ANALYSE:")
     print(f"{'-'*100}")
     
-    if month_projects:
+    if summary.projects:
         print(f"{'Projekt':<30} {'Zeit':<12} {'Anteil':<8} {'Ø/Tag':<8} {'Tage'}")
         print(f"{'-'*100}")
         
-        for project, duration in sorted(month_projects.items(), key=lambda x: x[1], reverse=True):
+        for project, duration in summary.top_projects():
             duration_str = format_duration(duration)
             percentage = (duration / total_month_seconds * 100) if total_month_seconds > 0 else 0
             
-            # Berechne an wie vielen Tagen gearbeitet wurde
-            project_days = 0
-            for day_date, day_data in daily_data.items():
-                if project in day_data['projects'] and day_data['projects'][project] > 0:
-                    project_days += 1
+            # An wie vielen Tagen am Projekt gearbeitet wurde
+            project_days = summary.project_days.get(project, 0)
             
             avg_per_day = format_duration(duration / project_days) if project_days > 0 else "0:00"
             
@@ -310,8 +208,8 @@ def generate_monthly_report(year, month):
     print(f"\n📈 PRODUKTIVITÄTS-METRIKEN:")
     print(f"{'-'*100}")
     
-    productive_days = sum(1 for day_data in daily_data.values() 
-                         if day_data['total_seconds'] > 0 and not day_data['is_weekend'] 
+    productive_days = sum(1 for day_date, day_data in daily_data.items() 
+                         if summary.day_total(day_date) > 0 and not day_data['is_weekend'] 
                          and not day_data['is_holiday'] and not day_data['is_vacation'])
     
     productivity_rate = (productive_days / working_days * 100) if working_days > 0 else 0
@@ -319,9 +217,9 @@ def generate_monthly_report(year, month):
     # Finde den produktivsten Tag
     best_day = None
     best_duration = 0
-    for day_date, day_data in daily_data.items():
-        if day_data['total_seconds'] > best_duration:
-            best_duration = day_data['total_seconds']
+    for day_date in month_dates:
+        if summary.day_total(day_date) > best_duration:
+            best_duration = summary.day_total(day_date)
             best_day = day_date
     
     print(f"Produktive Tage:     {productive_days}/{working_days} ({productivity_rate:.1f}%)")
@@ -334,14 +232,19 @@ def generate_monthly_report(year, month):
     print(f"{'='*100}\n")
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description='Timewarrior Monthly Report')
     parser.add_argument('--year', type=int, help='Jahr (Standard: aktuelles Jahr)')
     parser.add_argument('--month', type=int, help='Monat (1-12, Standard: aktueller Monat)')
     parser.add_argument('--last-month', action='store_true', help='Letzten Monat anzeigen')
     parser.add_argument('--months', type=int, default=1, help='Anzahl vergangener Monate (Standard: 1)')
+    parser.add_argument('--rebuild-cache', action='store_true', help='Intervall-Cache neu aufbauen')
     
     args = parser.parse_args()
     
+    if args.rebuild_cache:
+        rebuild_interval_cache()
+    
     today = date.today()
     
     if args.last_month:
@@ -354,15 +257,17 @@ def main():
             target_month = today.month - 1
         generate_monthly_report(target_year, target_month)
     elif args.months > 1:
-        # Mehrere Monate
+        # Mehrere Monate - ein Abruf für den ganzen Zeitraum
+        months = []
         for i in range(args.months - 1, -1, -1):
-            if today.month - i <= 0:
-                target_year = today.year - 1
-                target_month = 12 + (today.month - i)
-            else:
-                target_year = today.year
-                target_month = today.month - i
-            generate_monthly_report(target_year, target_month)
+            target_year, target_month = divmod(today.year * 12 + today.month - 1 - i, 12)
+            months.append((target_year, target_month + 1))
+        
+        periods = [(get_month_dates(y, m)[0], get_month_dates(y, m)[-1]) for y, m in months]
+        export_data = get_timewarrior_data_for_period(periods[0][0], periods[-1][1])
+        
+        for (target_year, target_month), month_data in zip(months, partition_table(export_data, periods)):
+            generate_monthly_report(target_year, target_month, month_data)
     elif args.year and args.month:
         # Spezifisches Jahr/Monat
         generate_monthly_report(args.year, args.month)
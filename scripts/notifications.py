@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Notifications
+Desktop-Benachrichtigungen für Hooks: im Hintergrund, einmal pro Tag, mit Ratenlimit
+
+notify-send läuft als abgelöster Prozess, der timew-Aufruf wartet nicht darauf.
+Gleiche Meldungen (bzw. gleicher key) werden pro Tag nur einmal gezeigt. Das
+Ratenlimit verzögert nur gewöhnliche Meldungen: sie warten in der Warteschlange
+und gelten erst als gemeldet, wenn sie gezeigt wurden. Kritische und einmalige
+Meldungen (mit key) kommen sofort.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import date
+
+STATE_FILE = os.path.expanduser('~/.timewarrior/data/cache/notifications.json')
+
+# Mindestabstand in Sekunden zwischen zwei gewöhnlichen Meldungen gleicher Dringlichkeit
+# ('critical' und Meldungen mit key sind ausgenommen)
+RATE_LIMITS = {
+    'low': 3600,
+    'normal': 300,
+}
+
+def load_state(today, state_file=STATE_FILE):
+    """Zustand von heute (ältere Tage werden verworfen)"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('date') == today:
+            return state
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {'date': today, 'sent': [], 'last': {}, 'queued': []}
+
+def save_state(state, state_file=STATE_FILE):
+    """Schreibe Zustand atomar"""
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    tmp_file = f"{state_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_file, state_file)
+
+def dispatch(title, message, urgency):
+    """Starte notify-send abgelöst; ohne Notifier Ausgabe auf stderr (nicht stdout = Hook-JSON)"""
+    import subprocess
+    try:
+        subprocess.Popen(['notify-send', title, message, '-u', urgency],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        print(f"\n{'='*50}", file=sys.stderr)
+        print(f"{title.upper()}: {message}", file=sys.stderr)
+        print(f"{'='*50}\n", file=sys.stderr)
+
+def _limited(state, item, now):
+    """Muss die Meldung noch warten?"""
+    if item['once'] or item['urgency'] == 'critical':
+        return False
+    return now - state['last'].get(item['urgency'], 0) < RATE_LIMITS.get(item['urgency'], 0)
+
+def notify(title, message, urgency='normal', key=None, state_file=STATE_FILE):
+    """Benachrichtige, falls heute noch nicht gemeldet
+
+    key kennzeichnet eine einmalige Meldung mit wechselndem Text (z.B.
+    Stundenwarnungen); sie kommt wie 'critical' am Ratenlimit vorbei. Ohne key
+    zählt der Text selbst, und eine zu frühe Meldung wird beim nächsten Aufruf
+    mit freiem Limit nachgeholt. Liefert True, wenn diese Meldung gezeigt wurde.
+    """
+    now = time.time()
+    state = load_state(date.today().isoformat(), state_file)
+    queued = state.setdefault('queued', [])
+    dedupe_key = key or message
+
+    if dedupe_key in state['sent']:
+        return False
+    if all(item['key'] != dedupe_key for item in queued):
+        queued.append({'key': dedupe_key, 'title': title, 'message': message,
+                       'urgency': urgency, 'once': key is not None})
+
+    delivered = []
+    for item in list(queued):
+        if _limited(state, item, now):
+            continue
+        queued.remove(item)
+        state['sent'].append(item['key'])
+        state['last'][item['urgency']] = now
+        delivered.append(item)
+
+    try:
+        save_state(state, state_file)
+    except OSError:
+        pass
+
+    for item in delivered:
+        dispatch(item['title'], item['message'], item['urgency'])
+    return any(item['key'] == dedupe_key for item in delivered)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Statistics
+Mehrjahres-Auswertung: Arbeitsbeginn, Wochentage, Tageslänge pro Quartal, Projekttrends
+
+Mit NumPy vektorisiert (searchsorted, cumsum, bincount), ohne NumPy in reinem
+Python mit identischen Ergebnissen. Tagessummen entstehen aus der kumulierten
+Arbeitszeit F(t) an den lokalen Mitternachten, damit auch Intervalle über
+Mitternacht richtig zählen. Normiert wird auf Arbeitstage (WorkdayCalendar:
+ohne Wochenenden, Feiertage und Urlaub).
+"""
+
+from datetime import date, timedelta
+
+from interval_table import OPEN_END
+from local_time import local_days
+from timew_data import get_interval_table, rebuild_interval_cache
+from workdays import get_workday_calendar
+
+WEEKDAYS_DE = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+
+# Änderung gegenüber dem Vorjahr, ab der ein Projekttrend als steigend/fallend gilt
+TREND_THRESHOLD = 0.10
+
+def load_numpy():
+    """NumPy, falls installiert (sonst None)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def format_duration(seconds):
+    """Formatiere Sekunden zu HH:MM"""
+    if seconds is None or seconds == 0:
+        return "0:00"
+
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours}:{minutes:02d}"
+
+def closed_columns(table, np=None):
+    """Start, Ende und Projekt-ID abgeschlossener Intervalle (aktive übersprungen)
+
+    Mit NumPy als Arrays direkt über den array('q')-Puffern der Tabelle, sonst
+    als Listen. Liefert zusätzlich die Projektnamen zu den IDs.
+    """
+    names = sorted(set(table.projects))
+    index = {name: position for position, name in enumerate(names)}
+    project_of_tag = [index[project] for project in table.projects]
+
+    if np is not None:
+        starts = np.frombuffer(table.starts, dtype=np.int64)
+        ends = np.frombuffer(table.ends, dtype=np.int64)
+        tag_ids = np.frombuffer(table.tag_ids, dtype=np.intc)
+        closed = ends != OPEN_END
+        project_ids = np.asarray(project_of_tag, dtype=np.intp)[tag_ids]
+        return starts[closed], ends[closed], project_ids[closed], names
+
+    rows = [(start, end, project_of_tag[tag_id])
+            for start, end, tag_id in zip(table.starts, table.ends, table.tag_ids)
+            if end != OPEN_END]
+    return [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows], names
+
+def split_by_project(np, starts, ends, project_ids, count):
+    """Start- und Endspalten je Projekt-ID (Masken bzw. ein Durchlauf)"""
+    if np is not None:
+        masks = (project_ids == project for project in range(count))
+        return [(starts[mask], ends[mask]) for mask in masks]
+    columns = [([], []) for _ in range(count)]
+    for start, end, project in zip(starts, ends, project_ids):
+        columns[project][0].append(start)
+        columns[project][1].append(end)
+    return columns
+
+def coverage_python(starts, ends, points):
+    """F(t) = gearbeitete Sekunden vor t für aufsteigende Zeitpunkte (Merge-Durchlauf)
+
+    F(t) = Σ_{start < t} (t - start) - Σ_{end < t} (t - end)
+    """
+    starts = sorted(starts)
+    ends = sorted(ends)
+    result = []
+    i = j = 0
+    sum_starts = sum_ends = 0
+    for t in points:
+        while i < len(starts) and starts[i] < t:
+            sum_starts += starts[i]
+            i += 1
+        while j < len(ends) and ends[j] < t:
+            sum_ends += ends[j]
+            j += 1
+        result.append((i * t - sum_starts) - (j * t - sum_ends))
+    return result
+
+def coverage_numpy(np, starts, ends, points):
+    """F(t) wie coverage_python, vektorisiert über searchsorted und cumsum"""
+    starts = np.sort(np.asarray(starts, dtype=np.int64))
+    ends = np.sort(np.asarray(ends, dtype=np.int64))
+    points = np.asarray(points, dtype=np.int64)
+    start_sums = np.concatenate(([0], np.cumsum(starts)))
+    end_sums = np.concatenate(([0], np.cumsum(ends)))
+    i = np.searchsorted(starts, points, side='left')
+    j = np.searchsorted(ends, points, side='left')
+    return (i * points - start_sums[i]) - (j * points - end_sums[j])
+
+def first_start_hours_python(starts, midnights):
+    """Stunde (seit lokaler Mitternacht) des ersten Intervallbeginns pro Tag als 24er-Histogramm"""
+    histogram = [0] * 24
+    day = 0
+    last_day = -1
+    for start in sorted(starts):
+        if start < midnights[0] or start >= midnights[-1]:
+            continue
+        while midnights[day + 1] <= start:
+            day += 1
+        if day != last_day:
+            histogram[min((start - midnights[day]) // 3600, 23)] += 1
+            last_day = day
+    return histogram
+
+def first_start_hours_numpy(np, starts, midnights):
+    """Histogramm wie first_start_hours_python über searchsorted/bincount"""
+    starts = np.sort(np.asarray(starts, dtype=np.int64))
+    midnights = np.asarray(midnights, dtype=np.int64)
+    starts = starts[(starts >= midnights[0]) & (starts < midnights[-1])]
+    if not len(starts):
+        return [0] * 24
+    days = np.searchsorted(midnights, starts, side='right') - 1
+    first = np.concatenate(([True], days[1:] != days[:-1]))
+    hours = np.minimum((starts[first] - midnights[days[first]]) // 3600, 23)
+    return np.bincount(hours, minlength=24).tolist()
+
+def sum_by_index(np, values, indexes, size):
+    """Summe der Werte je Index (bincount mit Gewichten bzw. Schleife)"""
+    if np is not None:
+        totals = np.bincount(np.asarray(indexes), weights=np.asarray(values, dtype=np.float64),
+                             minlength=size)
+        return totals.astype(np.int64).tolist()
+    totals = [0] * size
+    for value, index in zip(values, indexes):
+        totals[index] += value
+    return totals
+
+def compute_stats(table, first_day, last_day, np=None, calendar=None):
+    """Alle Kennzahlen für [first_day, last_day] (lokale Tage)
+
+    np: NumPy-Modul für den vektorisierten Weg, None für reines Python.
+    """
+    calendar = calendar or local_days()
+    workdays = get_workday_calendar()
+    day_count = (last_day - first_day).days + 1
+    days = [first_day + timedelta(days=offset) for offset in range(day_count)]
+    midnights = [calendar.midnight(day) for day in days]
+    midnights.append(calendar.midnight(last_day + timedelta(days=1)))
+
+    starts, ends, project_ids, names = closed_columns(table, np)
+    coverage = (lambda s, e, p: coverage_numpy(np, s, e, p).tolist()) if np is not None \
+        else coverage_python
+
+    # Tagessummen aus F(t) an den Mitternachten
+    covered = coverage(starts, ends, midnights)
+    day_seconds = [covered[i + 1] - covered[i] for i in range(day_count)]
+
+    # Arbeitsbeginn
+    if np is not None:
+        start_hours = first_start_hours_numpy(np, starts, midnights)
+    else:
+        start_hours = first_start_hours_python(starts, midnights)
+
+    # Wochentage
+    weekdays = [day.weekday() for day in days]
+    weekday_seconds = sum_by_index(np, day_seconds, weekdays, 7)
+    weekday_worked = sum_by_index(np, [1 if seconds > 0 else 0 for seconds in day_seconds], weekdays, 7)
+
+    # Quartale
+    quarter_keys = []
+    quarter_index = []
+    for day in days:
+        key = (day.year, (day.month - 1) // 3 + 1)
+        if not quarter_keys or quarter_keys[-1] != key:
+            quarter_keys.append(key)
+        quarter_index.append(len(quarter_keys) - 1)
+    quarter_seconds = sum_by_index(np, day_seconds, quarter_index, len(quarter_keys))
+    quarter_worked = sum_by_index(np, [1 if seconds > 0 else 0 for seconds in day_seconds],
+                                  quarter_index, len(quarter_keys))
+    quarters = []
+    for position, (year, quarter) in enumerate(quarter_keys):
+        start = max(date(year, 3 * quarter - 2, 1), first_day)
+        end = min(date(year + quarter // 4, 3 * quarter % 12 + 1, 1) - timedelta(days=1), last_day)
+        quarters.append({
+            'label': f"Q{quarter}/{year}",
+            'seconds': quarter_seconds[position],
+            'worked_days': int(quarter_worked[position]),
+            'working_days': workdays.working_days(start, end),
+        })
+
+    # Projekte pro Jahr (F(t) je Projekt an den Jahresgrenzen)
+    years = list(range(first_day.year, last_day.year + 1))
+    year_bounds = [midnights[0]]
+    year_bounds += [calendar.midnight(date(year, 1, 1)) for year in years[1:]]
+    year_bounds.append(midnights[-1])
+    year_working_days = [workdays.working_days(max(date(year, 1, 1), first_day),
+                                               min(date(year, 12, 31), last_day))
+                         for year in years]
+
+    project_years = {}
+    for name, (project_starts, project_ends) in zip(
+            names, split_by_project(np, starts, ends, project_ids, len(names))):
+        if not len(project_starts):
+            continue
+        covered = coverage(project_starts, project_ends, year_bounds)
+        project_years[name] = [covered[i + 1] - covered[i] for i in range(len(years))]
+
+    return {
+        'days': day_count,
+        'total': sum(day_seconds),
+        'working_days': workdays.working_days(first_day, last_day),
+        'start_hours': start_hours,
+        'weekday_seconds': weekday_seconds,
+        'weekday_worked': [int(count) for count in weekday_worked],
+        'quarters': quarters,
+        'years': years,
+        'year_working_days': year_working_days,
+        'project_years': project_years,
+    }
+
+def trend_symbol(previous, current):
+    """Pfeil für die Entwicklung gegenüber dem Vorjahr"""
+    if previous <= 0:
+        return '↗' if current > 0 else '→'
+    change = (current - previous) / previous
+    if change > TREND_THRESHOLD:
+        return '↗'
+    if change < -TREND_THRESHOLD:
+        return '↘'
+    return '→'
+
+def generate_stats_report(first_day, last_day, top=8, use_numpy=True):
+    """Gib die Mehrjahres-Statistik aus"""
+    np = load_numpy() if use_numpy else None
+    table = get_interval_table(first_day, last_day)
+    stats = compute_stats(table, first_day, last_day, np)
+
+    print(f"\n{'='*90}")
+    print(f"STATISTIK: {first_day.strftime('%d.%m.%Y')} - {last_day.strftime('%d.%m.%Y')}")
+    print(f"{'='*90}")
+    print(f"Intervalle:          {len(table)}")
+    print(f"Gesamtarbeitszeit:   {format_duration(stats['total'])} ({stats['total'] / 3600:.1f}h)")
+    print(f"Arbeitstage:         {stats['working_days']} "
+          f"(Ø {stats['total'] / 3600 / stats['working_days'] if stats['working_days'] else 0:.1f}h)")
+    print(f"Berechnung:          {'NumPy ' + np.__version__ if np is not None else 'reines Python'}")
+
+    # Arbeitsbeginn
+    print(f"\n🕐 ARBEITSBEGINN (erstes Intervall des Tages):")
+    print(f"{'-'*90}")
+    histogram = stats['start_hours']
+    peak = max(histogram)
+    if peak:
+        hours = [hour for hour, count in enumerate(histogram) if count]
+        for hour in range(hours[0], hours[-1] + 1):
+            count = histogram[hour]
+            bar = '█' * round(count / peak * 50)
+            print(f"{hour:02d}:00  {count:5d}  {bar}")
+    else:
+        print("Keine Daten")
+
+    # Wochentage
+    print(f"\n📅 WOCHENTAGE:")
+    print(f"{'-'*90}")
+    print(f"{'Tag':<12} {'Gesamt':<12} {'Tage':<6} {'Ø/Tag':<8} {'Anteil'}")
+    print(f"{'-'*90}")
+    for weekday, name in enumerate(WEEKDAYS_DE):
+        seconds = stats['weekday_seconds'][weekday]
+        worked = stats['weekday_worked'][weekday]
+        average = format_duration(seconds / worked) if worked else "0:00"
+        percentage = seconds / stats['total'] * 100 if stats['total'] else 0
+        print(f"{name:<12} {format_duration(seconds):<12} {worked:<6} {average:<8} {percentage:5.1f}%")
+
+    # Quartale
+    print(f"\n📊 TAGESLÄNGE PRO QUARTAL:")
+    print(f"{'-'*90}")
+    print(f"{'Quartal':<10} {'Gesamt':<12} {'Arbeitstage':<12} {'Gearbeitet':<11} "
+          f"{'Ø/Arbeitstag':<13} {'Ø/gearb. Tag'}")
+    print(f"{'-'*90}")
+    for quarter in stats['quarters']:
+        per_working_day = quarter['seconds'] / quarter['working_days'] if quarter['working_days'] else 0
+        per_worked_day = quarter['seconds'] / quarter['worked_days'] if quarter['worked_days'] else 0
+        print(f"{quarter['label']:<10} {format_duration(quarter['seconds']):<12} "
+              f"{quarter['working_days']:<12} {quarter['worked_days']:<11} "
+              f"{format_duration(per_working_day):<13} {format_duration(per_worked_day)}")
+
+    # Projekttrends
+    print(f"\n📈 PROJEKTTRENDS (Stunden pro Arbeitstag):")
+    print(f"{'-'*90}")
+    project_years = stats['project_years']
+    if project_years:
+        years = stats['years']
+        print(f"{'Projekt':<24} " + ' '.join(f"{year:>7}" for year in years) + "  Trend")
+        print(f"{'-'*90}")
+        ranked = sorted(project_years.items(), key=lambda x: sum(x[1]), reverse=True)[:top]
+        for project, seconds in ranked:
+            normalized = [value / 3600 / working_days if working_days else 0
+                          for value, working_days in zip(seconds, stats['year_working_days'])]
+            trend = trend_symbol(normalized[-2], normalized[-1]) if len(normalized) > 1 else '→'
+            print(f"{project[:24]:<24} " + ' '.join(f"{value:>6.2f}h" for value in normalized) + f"  {trend}")
+    else:
+        print("Keine Projektdaten verfügbar")
+
+    print(f"{'='*90}\n")
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Timewarrior Mehrjahres-Statistik')
+    parser.add_argument('--years', type=int, default=5, help='Anzahl Jahre bis heute (Standard: 5)')
+    parser.add_argument('--from', dest='start', help='Startdatum (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end', help='Enddatum (YYYY-MM-DD), Standard: heute')
+    parser.add_argument('--top', type=int, default=8, help='Anzahl Projekte im Trend (Standard: 8)')
+    parser.add_argument('--no-numpy', action='store_true', help='Reines Python auch wenn NumPy installiert ist')
+    parser.add_argument('--rebuild-cache', action='store_true', help='Intervall-Cache neu aufbauen')
+
+    args = parser.parse_args()
+
+    if args.rebuild_cache:
+        rebuild_interval_cache()
+
+    try:
+        last_day = date.fromisoformat(args.end) if args.end else date.today()
+        first_day = date.fromisoformat(args.start) if args.start \
+            else date(last_day.year - args.years + 1, 1, 1)
+    except ValueError:
+        print("❌ Ungültiges Datumsformat. Verwende: YYYY-MM-DD")
+        return
+
+    if first_day > last_day:
+        print("❌ Startdatum liegt nach dem Enddatum")
+        return
+
+    generate_stats_report(first_day, last_day, args.top, not args.no_numpy)
+
+if __name__ == '__main__':
+    main()
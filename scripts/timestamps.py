@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Timestamps
+Parser für Timewarrior-Zeitstempel (YYYYMMDDTHHMMSSZ) zu Epoch-Sekunden (int)
+
+Ersetzt datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp(): der
+Wert wird in Datum ('YYYYMMDD'), Stunde/Minute ('THHMM') und Sekunde ('SSZ')
+zerschnitten, jedes Stück kommt aus einer Tabelle. Die Tagestabelle wird
+monatsweise gefüllt, sobald ein Monat vorkommt; die Uhrzeit-Tabellen sind
+fest. Was in keiner Tabelle steht, ist kein gültiger Zeitstempel. Wiederholte
+Werte (erneute Hook-Aufrufe im Daemon, Rollup) kommen aus einem kleinen Memo.
+"""
+
+import re
+import time
+from datetime import date
+from operator import add, itemgetter
+
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'
+
+TIMESTAMP_PATTERN = re.compile(r'[0-9]{8}T(?:[01][0-9]|2[0-3])[0-5][0-9][0-5][0-9]Z')
+MONTH_PATTERN = re.compile(r'[0-9]{6}')
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Obergrenze des Memos; danach wird neu begonnen
+MEMO_SIZE = 4096
+
+_memo = {}
+
+# 'YYYYMMDD' -> Epoch-Sekunden der UTC-Mitternacht (ein Eintrag pro Kalendertag)
+_days = {}
+
+# Tagesteil der Schlüssel in _days
+_DAY_NUMBERS = [f'{day:02d}' for day in range(1, 32)]
+
+# 'THHMM' -> Sekunden seit Mitternacht, 'SSZ' -> Sekunden
+_HOURS_MINUTES = {f'T{hour:02d}{minute:02d}': 3600 * hour + 60 * minute
+                  for hour in range(24) for minute in range(60)}
+_SECONDS = {f'{second:02d}Z': second for second in range(60)}
+
+_DATE = itemgetter(slice(0, 8))
+_HOUR_MINUTE = itemgetter(slice(8, 13))
+_SECOND = itemgetter(slice(13, None))
+_START = itemgetter('start')
+_END = itemgetter('end')
+
+def _add_month(prefix):
+    """Trage alle Tage des Monats 'YYYYMM' in _days ein; ValueError bei ungültigem Monat"""
+    if not MONTH_PATTERN.fullmatch(prefix):
+        raise ValueError(f"Unbekannter Monat: {prefix}")
+    year, month = int(prefix[:4]), int(prefix[4:])
+    first = date(year, month, 1)
+    length = 31 if month == 12 else date(year, month + 1, 1).toordinal() - first.toordinal()
+    midnight = (first.toordinal() - EPOCH_ORDINAL) * 86400
+    for day in _DAY_NUMBERS[:length]:
+        _days[prefix + day] = midnight
+        midnight += 86400
+
+def _day_seconds(prefix):
+    """Epoch-Sekunden der UTC-Mitternacht zu 'YYYYMMDD' (gecacht); ValueError bei ungültigem Datum"""
+    seconds = _days.get(prefix)
+    if seconds is None:
+        _add_month(prefix[:6])
+        seconds = _days.get(prefix)
+        if seconds is None:
+            raise ValueError(f"Unbekanntes Datum: {prefix}")
+    return seconds
+
+def _parse(value):
+    """Zeitstempel ohne Memo parsen; ValueError bei anderem Format"""
+    try:
+        seconds = _days.get(value[:8])
+        if seconds is None:
+            seconds = _day_seconds(value[:8])
+        return seconds + _HOURS_MINUTES[value[8:13]] + _SECONDS[value[13:]]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Unbekanntes Zeitformat: {value}") from None
+
+def parse_epoch(value):
+    """Timewarrior-Zeitstempel zu Epoch-Sekunden (int); ValueError bei anderem Format"""
+    seconds = _memo.get(value)
+    if seconds is None:
+        try:
+            seconds = _days[value[:8]] + _HOURS_MINUTES[value[8:13]] + _SECONDS[value[13:]]
+        except (KeyError, TypeError):
+            # Neuer Monat oder ungültiger Wert
+            seconds = _parse(value)
+        if len(_memo) >= MEMO_SIZE:
+            _memo.clear()
+        _memo[value] = seconds
+    return seconds
+
+def _lookup(values):
+    """Epoch-Sekunden aus den drei Tabellen, spaltenweise; KeyError, wenn ein Stück fehlt"""
+    return list(map(add, map(add, map(_days.__getitem__, map(_DATE, values)),
+                             map(_HOURS_MINUTES.__getitem__, map(_HOUR_MINUTE, values))),
+                    map(_SECONDS.__getitem__, map(_SECOND, values))))
+
+def parse_many(values):
+    """Batch: Liste von Zeitstempeln zu Liste von Epoch-Sekunden
+
+    Dieselben Tabellen wie parse_epoch, aber spaltenweise mit map() statt
+    eines Funktionsaufrufs pro Wert; das Memo bleibt unberührt. Jeder Wert
+    wird einzeln nachgeschlagen und damit geprüft.
+    """
+    try:
+        return _lookup(values)
+    except (KeyError, TypeError):
+        pass
+    try:
+        # Neue Monate eintragen, dann noch einmal
+        for month in {prefix[:6] for prefix in set(map(_DATE, values)).difference(_days)}:
+            _add_month(month)
+        return _lookup(values)
+    except (KeyError, TypeError, ValueError):
+        # Einzeln, damit der fehlerhafte Wert in der Meldung steht
+        return list(map(_parse, values))
+
+def parse_bounds(intervals, now=None):
+    """Batch: Export-Einträge zu [(start, end), ...] in Epoch-Sekunden
+
+    Aktive Einträge (ohne end) enden bei now (None bleibt None).
+    """
+    starts = parse_many(list(map(_START, intervals)))
+    try:
+        ends = parse_many(list(map(_END, intervals)))
+    except KeyError:
+        # Aktive Einträge dabei: Enden einzeln zuordnen
+        closed = iter(parse_many([entry['end'] for entry in intervals if 'end' in entry]))
+        ends = [next(closed) if 'end' in entry else now for entry in intervals]
+    return list(zip(starts, ends))
+
+def format_epoch(seconds):
+    """Epoch-Sekunden zu Timewarrior-Zeitstempel (UTC)"""
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(seconds))
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Config
+Liest ~/.timewarrior/timewarrior.cfg für Hooks, Hook-Pipeline und Zeitzone
+"""
+
+import os
+
+CONFIG_FILE = os.path.expanduser('~/.timewarrior/timewarrior.cfg')
+
+def read_config(config_file=CONFIG_FILE):
+    """timewarrior.cfg als {schlüssel: wert} (nur 'key = value'-Zeilen)"""
+    config = {}
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                key, sep, value = line.partition('=')
+                if sep:
+                    config[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return config
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Data Reader
+Liest Intervalle direkt aus ~/.timewarrior/data/YYYY-MM.data statt `timew export` aufzurufen
+"""
+
+import os
+import re
+from bisect import bisect_right
+from datetime import timedelta
+
+from local_time import local_midnight
+from timestamps import TIMESTAMP_PATTERN, format_epoch
+
+DATA_DIR = os.path.expanduser('~/.timewarrior/data')
+
+# Nur Monatsdateien (YYYY-MM.data), nicht tags.data/undo.data
+DATA_FILE_PATTERN = re.compile(r'^(\d{4})-(\d{2})\.data$')
+
+def list_data_files(data_dir=DATA_DIR):
+    """Liste Monatsdateien sortiert als [((jahr, monat), pfad), ...]"""
+    files = []
+    for name in os.listdir(data_dir):
+        match = DATA_FILE_PATTERN.match(name)
+        if match:
+            files.append(((int(match.group(1)), int(match.group(2))), os.path.join(data_dir, name)))
+    files.sort()
+    return files
+
+def _tokenize(text):
+    """Zerlege Tag-/Annotation-Teil in Tokens (berücksichtigt Quotes und Escapes)"""
+    tokens = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == ' ':
+            i += 1
+        elif char == '"':
+            i += 1
+            value = []
+            while i < length and text[i] != '"':
+                if text[i] == '\\' and i + 1 < length:
+                    i += 1
+                value.append(text[i])
+                i += 1
+            if i >= length:
+                raise ValueError(f"Nicht geschlossenes Quote: {text}")
+            tokens.append((''.join(value), True))
+            i += 1
+        else:
+            end = text.find(' ', i)
+            if end == -1:
+                end = length
+            tokens.append((text[i:end], False))
+            i = end
+    return tokens
+
+def _check_timestamp(value):
+    """Prüfe Timewarrior-Zeitstempel (YYYYMMDDTHHMMSSZ)"""
+    if not TIMESTAMP_PATTERN.fullmatch(value):
+        raise ValueError(f"Unbekanntes Zeitformat: {value}")
+    return value
+
+def parse_data_line(line):
+    """Parse eine Zeile einer .data-Datei zu einem Export-Eintrag
+
+    Format: inc START [- END] [# tag1 "tag 2" [# "annotation"]]
+    """
+    line = line.rstrip('\n')
+    if not line.startswith('inc '):
+        raise ValueError(f"Unbekanntes Datenformat: {line}")
+
+    head, sep, rest = line[4:].partition(' #')
+    parts = head.split()
+    if len(parts) == 1:
+        entry = {'start': _check_timestamp(parts[0])}
+    elif len(parts) == 3 and parts[1] == '-':
+        entry = {'start': _check_timestamp(parts[0]), 'end': _check_timestamp(parts[2])}
+    else:
+        raise ValueError(f"Unbekanntes Datenformat: {line}")
+
+    if sep:
+        tokens = _tokenize(rest)
+        tags = []
+        annotation = None
+        for index, (value, quoted) in enumerate(tokens):
+            if value == '#' and not quoted:
+                # Annotation folgt nach dem zweiten '#' als einzelnes Token
+                if len(tokens) != index + 2:
+                    raise ValueError(f"Unbekanntes Datenformat: {line}")
+                annotation = tokens[index + 1][0]
+                break
+            tags.append(value)
+        if tags:
+            entry['tags'] = tags
+        if annotation:
+            entry['annotation'] = annotation
+
+    return entry
+
+def parse_data_file(path):
+    """Parse komplette Monatsdatei"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entries.append(parse_data_line(line))
+    return entries
+
+def count_data_lines(path):
+    """Zähle Intervalle einer Monatsdatei ohne sie zu parsen"""
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.startswith(b'inc '))
+
+def to_utc_stamp(local_date):
+    """Lokale Mitternacht eines Datums (konfigurierte Zeitzone) als Timewarrior-Zeitstempel (UTC)"""
+    return format_epoch(local_midnight(local_date))
+
+def get_range_bounds(start_date, end_date):
+    """Berechne UTC-Grenzen und Monatsbereich für [start_date, end_date] (inklusive, lokal)
+
+    Der Monatsbereich beginnt einen Monat früher, damit Intervalle gefunden werden,
+    die vor dem Zeitraum begonnen haben.
+    """
+    range_start = to_utc_stamp(start_date)
+    range_end = to_utc_stamp(end_date + timedelta(days=1))
+
+    first_month = (int(range_start[:4]), int(range_start[4:6]))
+    first_month = (first_month[0] - 1, 12) if first_month[1] == 1 else (first_month[0], first_month[1] - 1)
+    last_month = (int(range_end[:4]), int(range_end[4:6]))
+
+    return range_start, range_end, first_month, last_month
+
+def data_signature(start_date, end_date, data_dir=DATA_DIR):
+    """[Name, mtime_ns, Größe] der Monatsdateien, aus denen read_intervals den Zeitraum liest"""
+    _, _, first_month, last_month = get_range_bounds(start_date, end_date)
+    signature = []
+    for month, path in list_data_files(data_dir):
+        if first_month <= month <= last_month:
+            stat = os.stat(path)
+            signature.append([os.path.basename(path), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+def read_intervals(start_date, end_date, data_dir=DATA_DIR):
+    """Lese Intervalle, die den Zeitraum [start_date, end_date] (inklusive, lokal) schneiden
+
+    Öffnet nur die Monatsdateien, die den Zeitraum überdecken. Wirft ValueError,
+    wenn das Datenformat nicht erkannt wird.
+    """
+    range_start, range_end, first_month, last_month = get_range_bounds(start_date, end_date)
+
+    files = list_data_files(data_dir)
+    if not files:
+        raise ValueError(f"Keine Timewarrior-Daten in {data_dir}")
+
+    selected = []
+    later_count = 0
+    for month, path in files:
+        if month > last_month:
+            later_count += count_data_lines(path)
+        elif month >= first_month:
+            selected.append(parse_data_file(path))
+
+    # IDs wie bei `timew export`: @1 ist das jüngste Intervall der gesamten Datenbank
+    all_entries = [entry for entries in selected for entry in entries]
+    all_entries.sort(key=lambda x: x['start'])
+    next_id = later_count + len(all_entries)
+
+    result = []
+    for entry in all_entries:
+        entry_id = next_id
+        next_id -= 1
+        if entry['start'] >= range_end:
+            continue
+        if 'end' in entry and entry['end'] <= range_start:
+            continue
+        exported = {'id': entry_id}
+        exported.update(entry)
+        result.append(exported)
+
+    return result
+
+def read_interval_table(start_date, end_date, data_dir=DATA_DIR):
+    """Wie read_intervals, aber als IntervalTable (ohne IDs und Annotationen)
+
+    Jede Monatsdatei wird direkt an die Tabelle angehängt, statt alle Einträge
+    erst zu sammeln.
+    """
+    from interval_table import IntervalTable
+
+    range_start, range_end, first_month, last_month = get_range_bounds(start_date, end_date)
+
+    files = list_data_files(data_dir)
+    if not files:
+        raise ValueError(f"Keine Timewarrior-Daten in {data_dir}")
+
+    table = IntervalTable()
+    for month, path in files:
+        if not first_month <= month <= last_month:
+            continue
+        entries = [entry for entry in parse_data_file(path)
+                   if entry['start'] < range_end and ('end' not in entry or entry['end'] > range_start)]
+        entries.sort(key=lambda x: x['start'])
+        table.extend_stamps([entry['start'] for entry in entries], [entry.get('end') for entry in entries],
+                            [table.intern(entry.get('tags', ())) for entry in entries])
+
+    return table
+
+def export_intervals(start_date, end_date):
+    """Hole Intervalle über `timew export` (Fallback)"""
+    # Nur hier gebraucht: subprocess/json nicht beim Start jedes Reports/Hooks laden
+    import json
+    import subprocess
+
+    try:
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = (end_date + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        export_result = subprocess.run(['timew', 'export', start_str, 'to', end_str],
+                                     capture_output=True, text=True, check=True)
+
+        # Parse Export JSON
+        export_data = []
+        if export_result.stdout.strip():
+            try:
+                export_data = json.loads(export_result.stdout)
+            except ValueError:
+                export_data = []
+
+        return export_data
+
+    except (subprocess.CalledProcessError, OSError):
+        return []
+
+def get_intervals(start_date, end_date):
+    """Hole Intervalle für Zeitraum [start_date, end_date]
+
+    Reihenfolge: SQLite-Cache, direkte Datendateien, `timew export`.
+    """
+    try:
+        import interval_cache
+        try:
+            return interval_cache.query_intervals(start_date, end_date)
+        except interval_cache.CACHE_ERRORS:
+            pass
+    except ImportError:
+        pass
+
+    try:
+        return read_intervals(start_date, end_date)
+    except (ValueError, OSError):
+        return export_intervals(start_date, end_date)
+
+def get_interval_table(start_date, end_date):
+    """Wie get_intervals, aber als IntervalTable für die Auswertungen
+
+    Cache und Datendateien füllen die Tabelle direkt; nur der Fallback über
+    `timew export` geht den Weg über Export-Einträge.
+    """
+    try:
+        import interval_cache
+        try:
+            return interval_cache.query_table(start_date, end_date)
+        except interval_cache.CACHE_ERRORS:
+            pass
+    except ImportError:
+        pass
+
+    try:
+        return read_interval_table(start_date, end_date)
+    except (ValueError, OSError):
+        from interval_table import IntervalTable
+        return IntervalTable.from_export(export_intervals(start_date, end_date))
+
+def partition_intervals(intervals, periods):
+    """Verteile Intervalle auf Zeiträume [(start_date, end_date), ...]
+
+    Jeder Zeitraum erhält genau die Intervalle, die eine Einzelabfrage mit
+    get_intervals(start_date, end_date) liefern würde. Die Zeiträume müssen
+    aufsteigend sortiert sein und dürfen sich nicht überlappen.
+    """
+    bounds = [(to_utc_stamp(start_date), to_utc_stamp(end_date + timedelta(days=1)))
+              for start_date, end_date in periods]
+    period_starts = [bound[0] for bound in bounds]
+    result = [[] for _ in periods]
+
+    for entry in intervals:
+        end = entry.get('end')
+        index = max(bisect_right(period_starts, entry['start']) - 1, 0)
+        while index < len(bounds) and (end is None or bounds[index][0] < end):
+            if entry['start'] < bounds[index][1]:
+                result[index].append(entry)
+            index += 1
+
+    return result
+
+def partition_table(table, periods):
+    """Wie partition_intervals für eine IntervalTable; liefert je Zeitraum eine Tabelle"""
+    bounds = [(local_midnight(start_date), local_midnight(end_date + timedelta(days=1)))
+              for start_date, end_date in periods]
+    period_starts = [bound[0] for bound in bounds]
+    result = [[] for _ in periods]
+
+    # Aktive Intervalle enden bei OPEN_END und damit hinter jedem Zeitraum
+    for row, (start, end) in enumerate(zip(table.starts, table.ends)):
+        index = max(bisect_right(period_starts, start) - 1, 0)
+        while index < len(bounds) and bounds[index][0] < end:
+            if start < bounds[index][1]:
+                result[index].append(row)
+            index += 1
+
+    return [table.take(rows) for rows in result]
+
+def rebuild_interval_cache():
+    """Baue den SQLite-Cache neu auf (für --rebuild-cache)"""
+    try:
+        import interval_cache
+    except ImportError:
+        print("⚠️  SQLite nicht verfügbar - Cache deaktiviert")
+        return
+
+    try:
+        count = interval_cache.rebuild_cache()
+        print(f"🔄 Intervall-Cache neu aufgebaut ({count} Intervalle)")
+    except interval_cache.CACHE_ERRORS as e:
+        print(f"⚠️  Cache konnte nicht aufgebaut werden: {e}")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Today Status
+Vorberechneter Feiertags-/Urlaubsstatus des aktuellen Tages für den Holiday-Hook
+
+Die Antwort ändert sich höchstens einmal pro Tag: today.json wird beim ersten
+Hook-Aufruf eines neuen Tages oder nach Änderung einer Quelldatei neu erzeugt,
+alle weiteren Aufrufe lesen nur diese kleine Datei.
+"""
+
+import json
+import os
+from datetime import date
+
+from calendar_index import load_calendar, source_signature
+
+STATUS_FILE = os.path.expanduser('~/.timewarrior/data/cache/today.json')
+
+def build_status(today):
+    """Status eines Tages aus Kalender und Bundesland-Konfiguration"""
+    from holiday_manager import load_state_config, is_regional_holiday
+
+    calendar = load_calendar()
+    config = load_state_config() or {}
+    holiday = calendar.is_holiday(today)
+    vacation = calendar.is_vacation(today)
+
+    return {
+        'date': today.isoformat(),
+        'signature': list(source_signature()),
+        'holiday': holiday,
+        'regional': bool(holiday and config and is_regional_holiday(holiday)),
+        'vacation': vacation['name'] if vacation else None,
+        'state': config.get('state'),
+        'state_name': config.get('state_name'),
+    }
+
+def load_today_status(today=None, status_file=STATUS_FILE):
+    """Status von heute; neu erzeugt bei neuem Tag oder geänderten Quelldateien"""
+    today = today or date.today()
+    try:
+        with open(status_file, 'r', encoding='utf-8') as f:
+            status = json.load(f)
+        if status.get('date') == today.isoformat() and status.get('signature') == list(source_signature()):
+            return status
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    status = build_status(today)
+    try:
+        os.makedirs(os.path.dirname(status_file), exist_ok=True)
+        tmp_file = f"{status_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(status, f, ensure_ascii=False)
+        os.replace(tmp_file, status_file)
+    except OSError:
+        pass
+    return status
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Vacation Journal
+Append-only Journal für vacation.json mit stabilen IDs und periodischer Kompaktierung
+
+vacation.json ist der Snapshot (editierbar, jeder Eintrag mit 'id'),
+vacation.journal enthält danach angehängte Operationen als JSON-Zeilen:
+  {"op": "base", "seq": N}                     Stand nach Kompaktierung
+  {"op": "add", "id": N, "entry": {...}, "seq": N+1}
+  {"op": "remove", "id": N, "seq": M}
+'seq' ist jeweils die nächste freie ID, so dass ein Anhängen nur die letzte Zeile liest.
+Lesen schreibt nichts; Migration (IDs vergeben, Journal anlegen) geschieht beim
+nächsten Schreiben unter der Sperre. Eine beim Absturz angerissene letzte Zeile
+wird vor dem nächsten Anhängen abgeschnitten, unlesbare Zeilen werden übersprungen.
+"""
+
+import fcntl
+import json
+import os
+import sys
+
+VACATION_DIR = os.path.expanduser('~/.timewarrior/data/vacation')
+VACATION_FILE = os.path.join(VACATION_DIR, 'vacation.json')
+JOURNAL_FILE = os.path.join(VACATION_DIR, 'vacation.journal')
+LOCK_FILE = os.path.join(VACATION_DIR, '.vacation.lock')
+
+# Ab dieser Journalgröße wird in den Snapshot kompaktiert
+COMPACT_SIZE = 64 * 1024
+
+class _Lock:
+    """Exklusive Sperre für Journal und Snapshot (für parallele Skripte)"""
+
+    def __enter__(self):
+        os.makedirs(VACATION_DIR, exist_ok=True)
+        self.fd = os.open(LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+def _load_snapshot():
+    """Lade Snapshot (Liste von Einträgen)"""
+    try:
+        with open(VACATION_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def _write_snapshot(vacations):
+    """Schreibe Snapshot atomar"""
+    os.makedirs(VACATION_DIR, exist_ok=True)
+    tmp_file = f"{VACATION_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(vacations, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, VACATION_FILE)
+
+def _write_journal_base(next_id):
+    """Setze Journal auf den Stand nach einer Kompaktierung zurück"""
+    tmp_file = f"{JOURNAL_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'base', 'seq': next_id}) + '\n')
+    os.replace(tmp_file, JOURNAL_FILE)
+
+def _read_journal():
+    """Alle Journal-Operationen (unvollständige oder unlesbare Zeilen werden übersprungen)"""
+    operations = []
+    try:
+        with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith('\n'):
+                    continue
+                try:
+                    operations.append(json.loads(line))
+                except ValueError:
+                    print(f"⚠️  {JOURNAL_FILE}:{number}: unlesbare Zeile übersprungen", file=sys.stderr)
+    except FileNotFoundError:
+        return None
+    return operations
+
+def _last_operation():
+    """Letzte vollständige, lesbare Journalzeile, ohne das ganze Journal zu lesen"""
+    with open(JOURNAL_FILE, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        chunk = 4096
+        while True:
+            start = max(size - chunk, 0)
+            f.seek(start)
+            lines = f.read(size - start).split(b'\n')[:-1]
+            if start > 0:
+                # Erste Zeile ist evtl. nur angeschnitten
+                lines = lines[1:]
+            for line in reversed(lines):
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    continue
+            if start == 0:
+                return None
+            chunk *= 2
+
+def _repair_tail():
+    """Schneide eine angerissene letzte Zeile ab (nur bei gehaltener Sperre)
+
+    Sonst klebte die nächste Operation an ihr und beide wären unlesbar.
+    """
+    with open(JOURNAL_FILE, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        chunk = 4096
+        while True:
+            start = max(size - chunk, 0)
+            f.seek(start)
+            end = f.read(size - start).rfind(b'\n')
+            if end >= 0 or start == 0:
+                f.truncate(start + end + 1)
+                return
+            chunk *= 2
+
+def _replay(snapshot, operations):
+    """Wende Journal-Operationen auf den Snapshot an"""
+    entries = {entry['id']: entry for entry in snapshot}
+    for operation in operations:
+        if operation['op'] == 'add':
+            entry = dict(operation['entry'])
+            entry['id'] = operation['id']
+            entries[entry['id']] = entry
+        elif operation['op'] == 'remove':
+            entries.pop(operation['id'], None)
+    return sorted(entries.values(), key=lambda x: x['id'])
+
+def _assign_ids(snapshot, operations):
+    """Vergebe IDs für Einträge ohne 'id' (im Speicher); liefert die nächste freie ID
+
+    Neue IDs beginnen hinter Snapshot und Journal, damit ein von Hand ergänzter
+    Eintrag keine ID eines Journal-'add' erhält und beim Replay überschrieben wird.
+    Deterministisch: Lesen ohne Migration zeigt dieselben IDs, die die Migration schreibt.
+    """
+    next_id = max([entry['id'] + 1 for entry in snapshot if 'id' in entry]
+                  + [operation.get('seq', 0) for operation in operations] + [1])
+    for entry in snapshot:
+        if 'id' not in entry:
+            entry['id'] = next_id
+            next_id += 1
+    return next_id
+
+def _needs_migration(snapshot, operations):
+    return operations is None or any('id' not in entry for entry in snapshot)
+
+def _migrate(snapshot, operations):
+    """Schreibe IDs in den Snapshot und lege das Journal an (einmalig, bei gehaltener Sperre)"""
+    next_id = _assign_ids(snapshot, operations or [])
+    vacations = _replay(snapshot, operations or [])
+
+    _write_snapshot(vacations)
+    _write_journal_base(next_id)
+    return vacations
+
+def _load_locked():
+    """Lade Urlaube bei gehaltener Sperre vor einem Schreibzugriff (migriert bei Bedarf)"""
+    snapshot = _load_snapshot()
+    operations = _read_journal()
+    if _needs_migration(snapshot, operations):
+        return _migrate(snapshot, operations)
+    _repair_tail()
+    return _replay(snapshot, operations)
+
+def load_vacations():
+    """Lade Urlaube: Snapshot plus Journal, jeweils mit stabiler 'id' (schreibt nichts)"""
+    snapshot = _load_snapshot()
+    operations = _read_journal() or []
+    _assign_ids(snapshot, operations)
+    return _replay(snapshot, operations)
+
+def compact():
+    """Schreibe den aktuellen Stand als Snapshot und leere das Journal"""
+    with _Lock():
+        vacations = _load_locked()
+        last = _last_operation()
+        next_id = max([last['seq'] if last else 1] + [entry['id'] + 1 for entry in vacations])
+        _write_snapshot(vacations)
+        _write_journal_base(next_id)
+        return vacations
+
+def _append(operation):
+    """Hänge Operation an; kompaktiere, wenn das Journal zu groß wird"""
+    with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(operation, ensure_ascii=False) + '\n')
+        size = f.tell()
+    return size
+
+def append_vacation(entry):
+    """Füge Urlaub hinzu - O(1): liest nur das Journalende"""
+    with _Lock():
+        if os.path.exists(JOURNAL_FILE):
+            _repair_tail()
+        else:
+            _load_locked()
+
+        last = _last_operation()
+        vacation_id = last['seq'] if last else 1
+        entry = dict(entry)
+        entry['id'] = vacation_id
+        size = _append({'op': 'add', 'id': vacation_id, 'entry': entry, 'seq': vacation_id + 1})
+
+    if size > COMPACT_SIZE:
+        compact()
+    return entry
+
+def remove_vacation(vacation_id):
+    """Entferne Urlaub nach stabiler ID; liefert den entfernten Eintrag oder None"""
+    with _Lock():
+        removed = next((entry for entry in _load_locked() if entry['id'] == vacation_id), None)
+        if removed is None:
+            return None
+
+        last = _last_operation()
+        size = _append({'op': 'remove', 'id': vacation_id, 'seq': last['seq'] if last else vacation_id + 1})
+
+    if size > COMPACT_SIZE:
+        compact()
+    return removed
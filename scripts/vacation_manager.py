@@ -4,33 +4,14 @@ Timewarrior Vacation Manager
 Verwaltet Urlaub, Krankheit und andere Abwesenheiten
 """
 
-import json
-import os
-import argparse
 from datetime import datetime, date, timedelta
 
-def load_vacations():
-    """Lade Urlaubsdaten aus lokaler Datei"""
-    vacation_file = os.path.expanduser('~/.timewarrior/data/vacation/vacation.json')
-    try:
-        with open(vacation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
-
-def save_vacations(vacations):
-    """Speichere Urlaubsdaten in lokaler Datei"""
-    vacation_dir = os.path.expanduser('~/.timewarrior/data/vacation')
-    os.makedirs(vacation_dir, exist_ok=True)
-    
-    vacation_file = os.path.join(vacation_dir, 'vacation.json')
-    with open(vacation_file, 'w', encoding='utf-8') as f:
-        json.dump(vacations, f, ensure_ascii=False, indent=2)
+from calendar_index import VacationIndex, parse_date
+import vacation_journal
+from vacation_journal import load_vacations
 
 def add_vacation(start_date, end_date, name, vacation_type='Urlaub'):
-    """Füge neuen Urlaub hinzu"""
-    vacations = load_vacations()
-    
+    """Füge neuen Urlaub hinzu (hängt nur an das Journal an)"""
     # Konvertiere zu Strings falls nötig
     if isinstance(start_date, date):
         start_str = start_date.strftime('%Y-%m-%d')
@@ -56,32 +37,25 @@ def add_vacation(start_date, end_date, name, vacation_type='Urlaub'):
         'created': datetime.now().isoformat()
     }
     
-    vacations.append(vacation_entry)
-    save_vacations(vacations)
-    
-    return vacation_entry
+    return vacation_journal.append_vacation(vacation_entry)
 
-def remove_vacation(index):
-    """Entferne Urlaub nach Index"""
-    vacations = load_vacations()
-    
-    if 0 <= index < len(vacations):
-        removed = vacations.pop(index)
-        save_vacations(vacations)
-        return removed
-    return None
+def remove_vacation(vacation_id):
+    """Entferne Urlaub nach stabiler ID"""
+    return vacation_journal.remove_vacation(vacation_id)
 
 def list_vacations(year=None, vacation_type=None):
     """Liste alle Urlaube auf"""
-    vacations = load_vacations()
+    index = VacationIndex(load_vacations())
     
-    # Filter nach Jahr
+    # Filter nach Jahr (Bereichsabfrage über den Index)
     if year:
-        vacations = [v for v in vacations if v['start'].startswith(str(year))]
+        vacations = index.starting_between(date(year, 1, 1), date(year, 12, 31))
+    else:
+        vacations = index.all_entries()
     
     # Filter nach Typ
     if vacation_type:
-        vacations = [v for v in vacations if v['type'].lower() == vacation_type.lower()]
+        vacations = [(i, v) for i, v in vacations if v['type'].lower() == vacation_type.lower()]
     
     if not vacations:
         print("Keine Urlaubseinträge gefunden.")
@@ -90,15 +64,15 @@ def list_vacations(year=None, vacation_type=None):
     print(f"\n{'='*80}")
     print(f"URLAUB/ABWESENHEITEN{' ' + str(year) if year else ''}")
     print(f"{'='*80}")
-    print(f"{'Nr':<3} {'Von':>10} {'Bis':>10} {'Tage':>5} {'Typ':>10} {'Beschreibung'}")
+    print(f"{'ID':<3} {'Von':>10} {'Bis':>10} {'Tage':>5} {'Typ':>10} {'Beschreibung'}")
     print(f"{'-'*80}")
     
     total_days = 0
-    for i, vacation in enumerate(vacations):
-        start_date = datetime.strptime(vacation['start'], '%Y-%m-%d').date()
-        end_date = datetime.strptime(vacation['end'], '%Y-%m-%d').date()
+    for _, vacation in vacations:
+        start_date = parse_date(vacation['start'])
+        end_date = parse_date(vacation['end'])
         
-        print(f"{i:<3} {start_date.strftime('%d.%m.%Y'):>10} {end_date.strftime('%d.%m.%Y'):>10} "
+        print(f"{vacation['id']:<3} {start_date.strftime('%d.%m.%Y'):>10} {end_date.strftime('%d.%m.%Y'):>10} "
               f"{vacation['days']:>5} {vacation['type']:>10} {vacation['name']}")
         
         total_days += vacation['days']
@@ -107,24 +81,21 @@ def list_vacations(year=None, vacation_type=None):
     print(f"Gesamt: {total_days} Tage")
     print(f"{'='*80}\n")
 
-def is_vacation(check_date):
+def is_vacation(check_date, index=None):
     """Prüfe ob gegebenes Datum ein Urlaubstag ist"""
-    vacations = load_vacations()
+    if index is None:
+        index = VacationIndex(load_vacations())
     
     if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
+        check_date = parse_date(check_date)
     
-    for vacation in vacations:
-        if vacation['start'] <= date_str <= vacation['end']:
-            return vacation
-    return None
+    return index.lookup(check_date)
 
 def check_today():
     """Prüfe ob heute Urlaub ist"""
     today = date.today()
-    vacation = is_vacation(today)
+    index = VacationIndex(load_vacations())
+    vacation = is_vacation(today, index)
     
     if vacation:
         print(f"🏖️  Heute ({today.strftime('%d.%m.%Y')}) ist {vacation['type']}: {vacation['name']}")
@@ -132,25 +103,22 @@ def check_today():
         print(f"💼 Heute ({today.strftime('%d.%m.%Y')}) ist ein normaler Arbeitstag.")
         
         # Zeige nächsten Urlaub
-        vacations = load_vacations()
-        future_vacations = [v for v in vacations 
-                          if datetime.strptime(v['start'], '%Y-%m-%d').date() > today]
+        next_vacation = index.next_after(today)
         
-        if future_vacations:
-            # Sortiere nach Startdatum
-            future_vacations.sort(key=lambda x: x['start'])
-            next_vacation = future_vacations[0]
-            next_date = datetime.strptime(next_vacation['start'], '%Y-%m-%d').date()
+        if next_vacation:
+            next_date = parse_date(next_vacation['start'])
             days_until = (next_date - today).days
             
             print(f"🗓️  Nächster Urlaub: {next_vacation['name']} ab {next_date.strftime('%d.%m.%Y')} (in {days_until} Tagen)")
 
 def vacation_stats(year=None):
     """Zeige Urlaubsstatistiken"""
-    vacations = load_vacations()
+    index = VacationIndex(load_vacations())
     
     if year:
-        vacations = [v for v in vacations if v['start'].startswith(str(year))]
+        vacations = [v for _, v in index.starting_between(date(year, 1, 1), date(year, 12, 31))]
+    else:
+        vacations = [v for _, v in index.all_entries()]
     
     if not vacations:
         print(f"Keine Urlaubsdaten für {year or 'alle Jahre'} gefunden.")
@@ -183,6 +151,7 @@ def vacation_stats(year=None):
     print(f"{'='*50}\n")
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description='Timewarrior Vacation Manager')
     
     # Unterkommandos
@@ -202,7 +171,10 @@ def main():
     
     # Remove vacation
     remove_parser = subparsers.add_parser('remove', help='Urlaub entfernen')
-    remove_parser.add_argument('index', type=int, help='Index des zu entfernenden Urlaubs')
+    remove_parser.add_argument('id', type=int, help='ID des zu entfernenden Urlaubs (siehe list)')
+    
+    # Compact journal
+    subparsers.add_parser('compact', help='Journal in vacation.json übernehmen')
     
     # Stats
     stats_parser = subparsers.add_parser('stats', help='Urlaubsstatistiken')
@@ -224,11 +196,15 @@ def main():
         list_vacations(args.year, args.type)
         
     elif args.command == 'remove':
-        removed = remove_vacation(args.index)
+        removed = remove_vacation(args.id)
         if removed:
             print(f"✅ Urlaub entfernt: {removed['name']}")
         else:
-            print(f"❌ Ungültiger Index: {args.index}")
+            print(f"❌ Ungültige ID: {args.id}")
+            
+    elif args.command == 'compact':
+        vacations = vacation_journal.compact()
+        print(f"✅ Journal kompaktiert: {len(vacations)} Einträge in vacation.json")
             
     elif args.command == 'stats':
         vacation_stats(args.year)
@@ -245,7 +221,7 @@ def main():
         print("timew-vacation list                    # Alle Urlaube")
         print("timew-vacation list --year 2024        # Nur 2024")
         print("timew-vacation stats                   # Statistiken")
-        print("timew-vacation remove 0                # Ersten Urlaub entfernen")
+        print("timew-vacation remove 3                # Urlaub mit ID 3 entfernen")
 
 if __name__ == '__main__':
     main()
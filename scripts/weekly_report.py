@@ -4,52 +4,12 @@ Timewarrior Weekly Report
 Wöchentlicher Bericht mit Feiertags- und Urlaubserkennung
 """
 
-import subprocess
-import json
-import os
 from datetime import datetime, date, timedelta
-import argparse
 
-def load_holidays():
-    """Lade Feiertage aus lokaler Datei"""
-    holidays_file = os.path.expanduser('~/.timewarrior/data/holidays/holidays.json')
-    try:
-        with open(holidays_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return {}
-
-def load_vacations():
-    """Lade Urlaubsdaten aus lokaler Datei"""
-    vacation_file = os.path.expanduser('~/.timewarrior/data/vacation/vacation.json')
-    try:
-        with open(vacation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
-
-def is_holiday(check_date):
-    """Prüfe ob gegebenes Datum ein Feiertag ist"""
-    holidays = load_holidays()
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    return holidays.get(date_str, None)
-
-def is_vacation(check_date):
-    """Prüfe ob gegebenes Datum ein Urlaubstag ist"""
-    vacations = load_vacations()
-    
-    if isinstance(check_date, str):
-        date_str = check_date
-    else:
-        date_str = check_date.strftime('%Y-%m-%d')
-    
-    for vacation in vacations:
-        if vacation['start'] <= date_str <= vacation['end']:
-            return vacation
-    return None
+from aggregation import aggregate
+from calendar_index import is_holiday, is_vacation
+from workdays import working_days as count_working_days
+from timew_data import get_interval_table, partition_table, rebuild_interval_cache
 
 def get_week_dates(target_date):
     """Hole alle Daten der Woche (Montag bis Sonntag)"""
@@ -64,31 +24,8 @@ def get_week_dates(target_date):
     return week_dates
 
 def get_timewarrior_data_for_period(start_date, end_date):
-    """Hole Timewarrior-Daten für Zeitraum"""
-    try:
-        start_str = start_date.strftime('%Y-%m-%d')
-        end_str = end_date.strftime('%Y-%m-%d')
-        
-        # Hole export für detaillierte Daten
-        if start_str == end_str:
-            export_result = subprocess.run(['timew', 'export', start_str], 
-                                         capture_output=True, text=True, check=True)
-        else:
-            export_result = subprocess.run(['timew', 'export', f'{start_str}', f'to', f'{end_str}'], 
-                                         capture_output=True, text=True, check=True)
-        
-        # Parse Export JSON
-        export_data = []
-        if export_result.stdout.strip():
-            try:
-                export_data = json.loads(export_result.stdout)
-            except:
-                export_data = []
-        
-        return export_data
-        
-    except subprocess.CalledProcessError:
-        return []
+    """Hole Timewarrior-Daten für Zeitraum (inklusive end_date)"""
+    return get_interval_table(start_date, end_date)
 
 def format_duration(seconds):
     """Formatiere Sekunden zu HH:MM"""
@@ -99,8 +36,8 @@ def format_duration(seconds):
     minutes = int((seconds % 3600) // 60)
     return f"{hours}:{minutes:02d}"
 
-def generate_weekly_report(target_date):
-    """Generiere wöchentlichen Bericht"""
+def generate_weekly_report(target_date, export_data=None):
+    """Generiere wöchentlichen Bericht (export_data: bereits geladene Intervalle der Woche)"""
     
     if isinstance(target_date, str):
         date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
@@ -119,43 +56,12 @@ def generate_weekly_report(target_date):
     print(f"{'='*90}")
     
     # Hole alle Daten für die Woche
-    export_data = get_timewarrior_data_for_period(monday, sunday)
+    if export_data is None:
+        export_data = get_timewarrior_data_for_period(monday, sunday)
     
-    # Organisiere Daten nach Tagen
-    daily_data = {}
-    total_week_seconds = 0
-    
-    for day_date in week_dates:
-        daily_data[day_date] = {
-            'entries': [],
-            'total_seconds': 0,
-            'projects': {}
-        }
-    
-    # Verarbeite Export-Daten
-    for entry in export_data:
-        if 'end' not in entry:  # Aktive Einträge überspringen
-            continue
-            
-        start = datetime.fromisoformat(entry['start'].replace('Z', '+00:00'))
-        end = datetime.fromisoformat(entry['end'].replace('Z', '+00:00'))
-        duration = (end - start).total_seconds()
-        
-        # Zuordnung zum Tag (basierend auf Startzeit)
-        entry_date = start.date()
-        
-        if entry_date in daily_data:
-            daily_data[entry_date]['entries'].append(entry)
-            daily_data[entry_date]['total_seconds'] += duration
-            total_week_seconds += duration
-            
-            # Projektname aus Tags
-            tags = entry.get('tags', [])
-            project = tags[0] if tags else 'Ohne Projekt'
-            
-            if project not in daily_data[entry_date]['projects']:
-                daily_data[entry_date]['projects'][project] = 0
-            daily_data[entry_date]['projects'][project] += duration
+    # Ein Durchlauf: Tag × Projekt-Matrix der Woche (aktive Einträge übersprungen)
+    summary = aggregate(export_data, days=week_dates)
+    total_week_seconds = summary.total
     
     # Tägliche Übersicht
     print("📅 TÄGLICHE ÜBERSICHT:")
@@ -173,7 +79,7 @@ def generate_weekly_report(target_date):
         holiday_name = is_holiday(day_date)
         vacation = is_vacation(day_date)
         
-        total_seconds = daily_data[day_date]['total_seconds']
+        total_seconds = summary.day_total(day_date)
         time_str = format_duration(total_seconds)
         
         if holiday_name:
@@ -195,8 +101,7 @@ def generate_weekly_report(target_date):
                 status = "🔸 Kurz"
             
             # Top 2 Projekte
-            top_projects = sorted(daily_data[day_date]['projects'].items(), 
-                                key=lambda x: x[1], reverse=True)[:2]
+            top_projects = summary.top_projects(day_date, limit=2)
             projects_str = ", ".join([p[0][:15] for p in top_projects])
         
         print(f"{weekday_de:<12} {date_str:<12} {time_str:<12} {status:<15} {projects_str}")
@@ -205,16 +110,25 @@ def generate_weekly_report(target_date):
     
     # Wochensumme
     total_hours = total_week_seconds / 3600
-    average_per_day = total_hours / 5  # Arbeitstage
+    working_days = count_working_days(monday, sunday)
+    average_per_day = total_hours / working_days if working_days > 0 else 0
+    should_hours = working_days * 8
+    diff_hours = total_hours - should_hours
     
     print(f"\n📊 WOCHENSUMME:")
     print(f"⏰ Gesamtarbeitszeit: {format_duration(total_week_seconds)} ({total_hours:.1f}h)")
-    print(f"📊 Durchschnitt/Tag: {format_duration(total_week_seconds/5)} ({average_per_day:.1f}h)")
+    print(f"📊 Durchschnitt/Tag: {format_duration(total_week_seconds/working_days if working_days > 0 else 0)} ({average_per_day:.1f}h)")
+    print(f"🎯 Sollzeit ({working_days} Arbeitstage à 8h): {format_duration(should_hours * 3600)} ({should_hours:.1f}h)")
+    
+    if diff_hours > 0:
+        print(f"➕ Überstunden: +{format_duration(diff_hours * 3600)} (+{diff_hours:.1f}h)")
+    elif diff_hours < 0:
+        print(f"➖ Fehlstunden: -{format_duration(abs(diff_hours) * 3600)} (-{abs(diff_hours):.1f}h)")
     
-    # Bewertung
-    if total_hours >= 40:
+    # Bewertung (Schwellen relativ zur Sollzeit; bei 5 Arbeitstagen 40h/30h)
+    if should_hours > 0 and total_hours >= should_hours:
         print(f"✅ Vollzeit-Woche erreicht")
-    elif total_hours >= 30:
+    elif should_hours > 0 and total_hours >= should_hours * 0.75:
         print(f"⚠️  Teilzeit-Woche")
     elif total_hours > 0:
         print(f"🔸 Kurze Arbeitswoche")
@@ -228,21 +142,14 @@ def generate_weekly_report(target_date):
     print(f"\n📋 PROJEKT-ÜBERSICHT:")
     print(f"{'-'*90}")
     
-    week_projects = {}
-    for day_date, day_data in daily_data.items():
-        for project, duration in day_data['projects'].items():
-            if project not in week_projects:
-                week_projects[project] = 0
-            week_projects[project] += duration
-    
-    if week_projects:
+    if summary.projects:
         print(f"{'Projekt':<30} {'Zeit':<12} {'Anteil':<10} {'Ø/Tag'}")
         print(f"{'-'*90}")
         
-        for project, duration in sorted(week_projects.items(), key=lambda x: x[1], reverse=True):
+        for project, duration in summary.top_projects():
             duration_str = format_duration(duration)
             percentage = (duration / total_week_seconds * 100) if total_week_seconds > 0 else 0
-            avg_per_day = format_duration(duration / 5)  # 5 Arbeitstage
+            avg_per_day = format_duration(duration / max(working_days, 1))
             
             print(f"{project:<30} {duration_str:<12} {percentage:6.1f}%   {avg_per_day}")
     else:
@@ -251,19 +158,27 @@ def generate_weekly_report(target_date):
     print(f"{'='*90}\n")
 
 def main():
+    import argparse
     parser = argparse.ArgumentParser(description='Timewarrior Weekly Report')
     parser.add_argument('date', nargs='?', help='Datum (YYYY-MM-DD), Standard: diese Woche')
     parser.add_argument('--last-week', action='store_true', help='Letzte Woche anzeigen')
     parser.add_argument('--weeks', type=int, default=1, help='Anzahl vergangener Wochen (Standard: 1)')
+    parser.add_argument('--rebuild-cache', action='store_true', help='Intervall-Cache neu aufbauen')
     
     args = parser.parse_args()
     
+    if args.rebuild_cache:
+        rebuild_interval_cache()
+    
     if args.weeks > 1:
-        # Zeige mehrere Wochen
+        # Zeige mehrere Wochen - ein Abruf für den ganzen Zeitraum
         today = date.today()
-        for i in range(args.weeks - 1, -1, -1):
-            target_date = today - timedelta(weeks=i)
-            generate_weekly_report(target_date)
+        weeks = [get_week_dates(today - timedelta(weeks=i)) for i in range(args.weeks - 1, -1, -1)]
+        export_data = get_timewarrior_data_for_period(weeks[0][0], weeks[-1][-1])
+        
+        periods = [(week[0], week[-1]) for week in weeks]
+        for week, week_data in zip(weeks, partition_table(export_data, periods)):
+            generate_weekly_report(week[0], week_data)
     elif args.last_week:
         last_week = date.today() - timedelta(weeks=1)
         generate_weekly_report(last_week)
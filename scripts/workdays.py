@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Timewarrior Working Days
+Arbeitstags-Arithmetik über eine Bitmap (Wochenenden, Feiertage, Urlaub) mit Präfixsummen
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+
+from calendar_index import get_calendar_index
+
+# Wie weit nth_working_day/add_working_days maximal über den geladenen Bereich hinaus sucht
+MAX_EXTEND_YEARS = 50
+
+class WorkdayCalendar:
+    """Arbeitstage als Bitmap pro Jahr mit kumulierten Präfixsummen
+
+    Ein Arbeitstag ist Montag bis Freitag und weder Feiertag noch Urlaub.
+    Die Bitmap deckt einen zusammenhängenden Jahresbereich ab, der bei Bedarf
+    erweitert wird. prefix[i] ist die Anzahl Arbeitstage vor dem i-ten Tag.
+    """
+
+    def __init__(self, calendar_index=None):
+        self.calendar_index = calendar_index or get_calendar_index()
+        self.first_year = None
+        self.last_year = None
+        self.base = 0
+        self.bitmap = bytearray()
+        self.prefix = array('q', [0])
+
+    def _year_bits(self, year):
+        """Bitmap eines Jahres (1 = Arbeitstag)"""
+        index = self.calendar_index
+        current = date(year, 1, 1)
+        bits = bytearray()
+        while current.year == year:
+            bits.append(1 if current.weekday() < 5 and not index.is_holiday(current)
+                        and not index.is_vacation(current) else 0)
+            current += timedelta(days=1)
+        return bits
+
+    def _ensure_years(self, first_year, last_year):
+        """Erweitere die Bitmap auf [first_year, last_year]"""
+        if self.first_year is None:
+            self.first_year = self.last_year = first_year
+            self.base = date(first_year, 1, 1).toordinal()
+            self.bitmap = self._year_bits(first_year)
+        else:
+            first_year = min(first_year, self.first_year)
+            last_year = max(last_year, self.last_year)
+
+        if first_year < self.first_year:
+            bits = bytearray()
+            for year in range(first_year, self.first_year):
+                bits += self._year_bits(year)
+            self.bitmap = bits + self.bitmap
+            self.first_year = first_year
+            self.base = date(first_year, 1, 1).toordinal()
+            self.prefix = array('q', [0])
+
+        for year in range(self.last_year + 1, last_year + 1):
+            self.bitmap += self._year_bits(year)
+        self.last_year = max(self.last_year, last_year)
+
+        # Präfixsummen nur für neu hinzugekommene Tage fortschreiben
+        prefix = self.prefix
+        total = prefix[-1]
+        for bit in self.bitmap[len(prefix) - 1:]:
+            total += bit
+            prefix.append(total)
+
+    def _offset(self, day):
+        """Index eines Datums in der Bitmap (lädt fehlende Jahre)"""
+        if self.first_year is None or not self.first_year <= day.year <= self.last_year:
+            self._ensure_years(day.year, day.year)
+        return day.toordinal() - self.base
+
+    def is_working_day(self, day):
+        """Ist das Datum ein Arbeitstag? - O(1)"""
+        return bool(self.bitmap[self._offset(day)])
+
+    def working_days(self, start_date, end_date):
+        """Anzahl Arbeitstage in [start_date, end_date] (inklusive) - O(1)"""
+        if end_date < start_date:
+            return 0
+        start = self._offset(start_date)
+        end = self._offset(end_date)
+        return self.prefix[end + 1] - self.prefix[start]
+
+    def nth_working_day(self, start_date, n):
+        """n-ter Arbeitstag ab start_date (inklusive, n >= 1) - O(log n)"""
+        if n < 1:
+            raise ValueError("n muss mindestens 1 sein")
+        target = self.prefix[self._offset(start_date)] + n
+
+        for _ in range(MAX_EXTEND_YEARS):
+            if self.prefix[-1] >= target:
+                return date.fromordinal(self.base + bisect_left(self.prefix, target) - 1)
+            self._ensure_years(self.last_year + 1, self.last_year + 1)
+        raise ValueError(f"Kein {n}. Arbeitstag ab {start_date} gefunden")
+
+    def add_working_days(self, day, n):
+        """Datum n Arbeitstage nach (n > 0) bzw. vor (n < 0) day - O(log n)"""
+        if n > 0:
+            return self.nth_working_day(day + timedelta(days=1), n)
+        if n == 0:
+            return day
+
+        for _ in range(MAX_EXTEND_YEARS):
+            # Anzahl Arbeitstage vor day muss mindestens |n| sein
+            target = self.prefix[self._offset(day)] + n + 1
+            if target >= 1:
+                return date.fromordinal(self.base + bisect_left(self.prefix, target) - 1)
+            self._ensure_years(self.first_year - 1, self.first_year - 1)
+        raise ValueError(f"Kein Arbeitstag {-n} Tage vor {day} gefunden")
+
+_workday_calendar = None
+
+def get_workday_calendar():
+    """Prozessweiter WorkdayCalendar auf Basis des CalendarIndex"""
+    global _workday_calendar
+    if _workday_calendar is None:
+        _workday_calendar = WorkdayCalendar()
+    return _workday_calendar
+
+def working_days(start_date, end_date):
+    """Anzahl Arbeitstage in [start_date, end_date] (inklusive)"""
+    return get_workday_calendar().working_days(start_date, end_date)
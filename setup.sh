@@ -17,16 +17,25 @@ fi
 echo "✅ Timewarrior gefunden"
 
 TIMEW_DIR="$HOME/.timewarrior"
-mkdir -p "$TIMEW_DIR/hooks"
+mkdir -p "$TIMEW_DIR/hooks/stages"
 mkdir -p "$TIMEW_DIR/data/holidays"
 mkdir -p "$TIMEW_DIR/data/vacation"
 mkdir -p "$TIMEW_DIR/data/config"
+mkdir -p "$TIMEW_DIR/lib"
 
 echo "📂 Installiere Hooks..."
-cp hooks/on-modify-autopause "$TIMEW_DIR/hooks/"
-cp hooks/on-modify-warnings "$TIMEW_DIR/hooks/"
-cp hooks/on-modify-holidays "$TIMEW_DIR/hooks/"
-chmod +x "$TIMEW_DIR/hooks/"*
+cp hooks/on-modify "$TIMEW_DIR/hooks/"
+chmod +x "$TIMEW_DIR/hooks/on-modify"
+# Einzelne Prüfungen laufen als Stufen des Dispatchers (nicht mehr als eigene Hooks)
+for stage in on-modify-autopause on-modify-warnings on-modify-holidays; do
+    cp "hooks/$stage" "$TIMEW_DIR/hooks/stages/"
+    rm -f "$TIMEW_DIR/hooks/$stage"
+done
+
+echo "📚 Installiere gemeinsame Module für Hooks..."
+for module in timew_data.py timestamps.py local_time.py interval_cache.py vacation_journal.py calendar_index.py calendar_store.py holiday_manager.py hook_client.py hook_pipeline.py timew_config.py daily_rollup.py notifications.py today_status.py; do
+    cp "scripts/$module" "$TIMEW_DIR/lib/"
+done
 
 echo "⚙️ Installiere Konfiguration..."
 cp config/timewarrior.cfg "$TIMEW_DIR/"
@@ -37,11 +46,13 @@ mkdir -p "$HOME/.local/bin"
 ln -sf "$(pwd)/scripts/daily_report.py" "$HOME/.local/bin/timew-daily"
 ln -sf "$(pwd)/scripts/weekly_report.py" "$HOME/.local/bin/timew-weekly"
 ln -sf "$(pwd)/scripts/monthly_report.py" "$HOME/.local/bin/timew-monthly"
+ln -sf "$(pwd)/scripts/stats_report.py" "$HOME/.local/bin/timew-stats"
 ln -sf "$(pwd)/scripts/holiday_manager.py" "$HOME/.local/bin/timew-holidays"
 ln -sf "$(pwd)/scripts/vacation_manager.py" "$HOME/.local/bin/timew-vacation"
+ln -sf "$(pwd)/scripts/hook_daemon.py" "$HOME/.local/bin/timew-hookd"
 
 echo "🏖️ Erstelle Feiertags- und Urlaubsdaten..."
-python3 scripts/holiday_manager.py --update-holidays 2024
+python3 scripts/holiday_manager.py --update-holidays "$(date +%Y)"
 
 echo ""
 echo "🎉 Installation abgeschlossen!"